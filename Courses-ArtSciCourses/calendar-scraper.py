@@ -1,24 +1,80 @@
 from random import randint
 import argparse
+import os
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import time
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from lxml import etree, html
 import re
+import shelve
 
 COURSE_URL = "https://artsci.calendar.utoronto.ca/search-courses"
 PROGRAM_URL = "https://artsci.calendar.utoronto.ca/search-programs"
 
+# Number of result pages requested at once; the polite delay is applied between batches
+CONCURRENT_PAGES = 8
+# Blocks are parsed a page at a time in worker processes, so more workers than pages per batch would sit idle
+PARSE_WORKERS = min(CONCURRENT_PAGES, os.cpu_count() or 1)
+# ETag and parsed records of every page from previous runs, used to revalidate unchanged pages.
+# Kept next to the script so every run finds it whatever the working directory
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calendar_cache")
+# Version of the records the parsers produce; bump it whenever parse_course_block or
+# parse_program_block change their output, so pages cached by an older parser are parsed again
+CACHE_VERSION = 1
+
+PROGRAM_TITLE_RE = re.compile(r'^(?P<name>.+?)\s*\((?P<category>[^)]+)\)\s*-\s*(?P<code>[A-Z0-9]+)')
+COMPLETION_RE = re.compile("Completion Requirements", re.IGNORECASE)
+
+# Only the accordion blocks are extracted, so skip building nodes for comments,
+# processing instructions and whitespace-only text in the surrounding page chrome.
+# Pages are handed over as raw bytes; the calendar is always served as UTF-8
+HTML_PARSER = html.HTMLParser(encoding="utf-8", remove_blank_text=True, remove_comments=True, remove_pis=True)
+
+def has_class(name):
+    # XPath predicate matching one class token, like the CSS selector ".name"
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# XPath queries run for every page or block, compiled once
+HEADERS_XPATH = etree.XPath(f"//h3[{has_class('js-views-accordion-group-header')}]")
+DETAILS_XPATH = etree.XPath(f"../descendant::div[{has_class('views-row')}][1]")
+TEXT_NODES_XPATH = etree.XPath(".//text()")
+
+def text_of(elm):
+    # lxml equivalent of BeautifulSoup's get_text(strip=True)
+    if not len(elm):  # Text-only element (hours, codes, links), no subtree to walk
+        return (elm.text or "").strip()
+    return "".join(s.strip() for s in elm.itertext())
+
+def get_text(fields, field):
+    # Text of the field's first .field-content element, like select_one
+    elms = fields.get(field)
+    return text_of(elms[0]) if elms else None
+
+def get_list(fields, field):
+    # Text of every link in the field's .field-content elements, read from the index built
+    # in parse_course_block rather than another search of the details block
+    elms = fields.get(field)
+    if not elms:
+        return None
+    return [text_of(a) for elm in elms for a in elm.iter("a")] or None
+
 def parse_course_block(header):
     data = {}
     # get the full header text (aria-label may sometimes truncate around punctuation)
-    title_str = header.get_text(strip=True)
+    title_str = text_of(header)
 
-    # match "CODE – Course Title" or "CODE - Course Title", once only
-    m = re.match(r'^(?P<code>[^–-]+?)\s*[–-]\s*(?P<name>.+)$', title_str)
-    if m:
-        code = m.group("code").strip()
-        name = m.group("name").strip()
+    # split "CODE – Course Title" or "CODE - Course Title" on the first dash of either kind, once only
+    code, sep, name = title_str.partition("–")
+    if "-" in code:
+        code, sep, name = title_str.partition("-")
+    if sep and code and name:
+        code = code.strip()
+        name = name.strip()
     else:
         code = title_str
         name = None
@@ -26,37 +82,53 @@ def parse_course_block(header):
     data["code"] = code
     data["name"] = name
 
-    details = header.parent.find("div", class_="views-row")
-    def get_text(selector):
-        elm = details.select_one(selector)
-        return elm.get_text(strip=True) if elm else None
+    details = DETAILS_XPATH(header)[0]
+
+    # Map every .views-field-* container class to all of its .field-content elements, in
+    # document order, in a single walk
+    fields = {}
+    for content in details.find_class("field-content"):
+        nested = False  # Inside another .field-content, whose text and links already include it
+        for container in content.iterancestors():
+            if container is details:
+                break
+            classes = container.get("class", "").split()
+            if "field-content" in classes:
+                nested = True
+                continue
+            if nested:
+                continue
+            for cls in classes:
+                if cls.startswith("views-field-"):
+                    elms = fields.setdefault(cls, [])
+                    if not elms or elms[-1] is not content:
+                        elms.append(content)
 
-    def get_list(selector):
-        elm = details.select(selector + " a")
-        return [a.get_text(strip=True) for a in elm] or None
+    body = fields.get("views-field-body")
 
-    data["previous_course_number"] = get_text(".views-field-field-previous-course-number .field-content")
-    data["hours"]                  = get_text(".views-field-field-hours .field-content")
+    data["previous_course_number"] = get_text(fields, "views-field-field-previous-course-number")
+    data["hours"]                  = get_text(fields, "views-field-field-hours")
     data["description"]            = "\n".join(
-        p.get_text(strip=True)
-        for p in details.select(".views-field-body .field-content p")
-    )
-    data["exclusions"]             = get_list(".views-field-field-exclusion .field-content")
-    data["prerequisites"]          = get_text(".views-field-field-prerequisite .field-content")
-    data["corequisites"]           = get_text(".views-field-field-corequisite .field-content")
-    data["recommended"]            = get_text(".views-field-field-recommended .field-content")
-    data["breadth_requirements"]   = get_text(".views-field-field-breadth-requirements .field-content")
+        text_of(p)
+        for elm in body
+        for p in elm.iter("p")
+    ) if body else ""
+    data["exclusions"]             = get_list(fields, "views-field-field-exclusion")
+    data["prerequisites"]          = get_text(fields, "views-field-field-prerequisite")
+    data["corequisites"]           = get_text(fields, "views-field-field-corequisite")
+    data["recommended"]            = get_text(fields, "views-field-field-recommended")
+    data["breadth_requirements"]   = get_text(fields, "views-field-field-breadth-requirements")
 
     return data
 
 def parse_program_block(header):
     data = {}
     # Get the full header text
-    title_str = header.get_text(strip=True)
+    title_str = text_of(header)
     
     # Regular expression to match program title pattern:
     # "Program Name (Program Category) - PROGRAM_CODE"
-    m = re.match(r'^(?P<name>.+?)\s*\((?P<category>[^)]+)\)\s*-\s*(?P<code>[A-Z0-9]+)', title_str)
+    m = PROGRAM_TITLE_RE.match(title_str)
     
     if m:
         program_name = m.group("name").strip()
@@ -72,94 +144,165 @@ def parse_program_block(header):
     data["code"] = program_code
     
     # Get program content
-    details = header.parent.find("div", class_="views-row")
+    matches = DETAILS_XPATH(header)
+    details = matches[0] if matches else None
     
     # Extract the content
-    if details:
+    if details is not None:
         # Get all paragraphs from the program description
-        paragraphs = details.find_all("p")
-        if paragraphs:
-            data["description"] = "\n".join(p.get_text(strip=True) for p in paragraphs)
+        # (keyed by element so the completion requirements below can reuse the text)
+        paragraph_text = {p: text_of(p) for p in details.iter("p")}
+        if paragraph_text:
+            data["description"] = "\n".join(paragraph_text.values())
         else:
-            data["description"] = details.get_text(strip=True)
+            data["description"] = text_of(details)
             
         # Look for completion requirements section which is often formatted differently
-        completion_reqs = details.find(string=re.compile("Completion Requirements", re.IGNORECASE))
-        if completion_reqs:
+        completion_reqs = next((t for t in TEXT_NODES_XPATH(details) if COMPLETION_RE.search(t)), None)
+        if completion_reqs is not None:
             # Find the parent element and get all the text afterwards
-            parent = completion_reqs.parent
-            if parent:
+            parent = completion_reqs.getparent()
+            if completion_reqs.is_tail:
+                parent = parent.getparent()
+            if parent is not None:
                 # Get all siblings after the completion requirements header
-                requirements_text = []
-                for sibling in parent.next_siblings:
-                    if sibling.name == "h3":  # Stop at next header
+                # (lxml keeps the text between siblings in each element's tail)
+                requirements_text = [(parent.tail or "").strip()]
+                for sibling in parent.itersiblings():
+                    if sibling.tag == "h3":  # Stop at next header
                         break
-                    if hasattr(sibling, "get_text"):
-                        requirements_text.append(sibling.get_text(strip=True))
+                    requirements_text.append(paragraph_text.get(sibling) or text_of(sibling))
+                    requirements_text.append((sibling.tail or "").strip())
                 
                 data["completion_requirements"] = "\n".join(requirement for requirement in requirements_text if requirement)
     
     return data
 
-def scrape_courses():
-    print("Scraping courses...")
-    page = 0
-    courses = []
-
-    while True:
-        resp = requests.get(COURSE_URL, params={"page": page})
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        if soup.find(string="Your search yielded no results."):
-            break
-
-        headers = soup.select("h3.js-views-accordion-group-header")
-        if not headers:
-            break
-            
-        for header in headers:
-            courses.append(parse_course_block(header))
+def make_session():
+    # Keep-alive session whose pool holds one connection per concurrent page request
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CONCURRENT_PAGES,
+                          max_retries=Retry(total=3, backoff_factor=0.5))
+    session.mount("https://", adapter)
+    return session
 
-        print(f"Page {page}: collected {len(headers)} courses")
-        page += 1
-        time.sleep(randint(2, 5))  # Add some random delay to be more polite to the server
+def fetch_page(session, url, page, etag=None):
+    # Returns (etag, content); content is None when the server says our cached copy is still current
+    headers = {"If-None-Match": etag} if etag else None
+    resp = session.get(url, params={"page": page}, headers=headers)
+    if resp.status_code == 304:
+        return etag, None
+    resp.raise_for_status()
+    # Raw bytes go straight to lxml, skipping the decode into a Python str and halving
+    # what gets pickled over to the parser processes
+    return resp.headers.get("ETag"), resp.content
 
-    print(f"Total courses collected: {len(courses)}")
-    with open('courses.json', 'w', encoding='utf-8') as f:
-        json.dump(courses, f, ensure_ascii=False, indent=4)
-        f.write("\n")
-    
-    return courses
+def fetch_batch(pool, fetch, *iterables):
+    # Like pool.map(fetch, *iterables), but returns the results up to the first page that fails
+    # together with that failure (or None). Pages past the last one may fail outright (404 or 5xx),
+    # which only matters if none of the pages before them turns out to be the end of the results
+    results = []
+    for future in [pool.submit(fetch, *args) for args in zip(*iterables)]:
+        try:
+            results.append(future.result())
+        except requests.RequestException as e:
+            return results, e
+    return results, None
 
-def scrape_programs():
-    print("Scraping programs...")
+def parse_page(content, parse_block):
+    # Runs in a worker process; returns None once we're past the last page of results
+    tree = html.fromstring(content, parser=HTML_PARSER)
+    headers = HEADERS_XPATH(tree)
+    # If no headers are found, we've reached the end. The "Your search yielded no results."
+    # page never has any, so there's no need to walk every text node looking for it
+    if not headers:
+        return None
+
+    return [parse_block(header) for header in headers]
+
+@contextmanager
+def json_array_writer(path):
+    # Write records into a JSON array as they are parsed instead of holding them all in memory.
+    # The layout matches orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    # The array goes to a temporary file that replaces path only once the scrape has finished,
+    # so a failed or interrupted run leaves the previous output in place
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            count = 0
+
+            def write(record):
+                nonlocal count
+                f.write(b",\n  " if count else b"[\n  ")
+                f.write(orjson.dumps(record, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+                count += 1
+
+            yield write
+            f.write(b"\n]\n" if count else b"[]\n")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+def scrape(url, parse_block, outfile, label):
+    print(f"Scraping {label}...")
     page = 0
-    programs = []
-    
-    while True:
-        resp = requests.get(PROGRAM_URL, params={"page": page})
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        if soup.find(string="Your search yielded no results."):
-            break
-
-        headers = soup.select("h3.js-views-accordion-group-header")
-        if not headers:  # If no headers are found, we've reached the end
-            break
-            
-        for header in headers:
-            programs.append(parse_program_block(header))
+    total = 0
+    finished = False
+
+    with make_session() as session, ThreadPoolExecutor(max_workers=CONCURRENT_PAGES) as pool, \
+            ProcessPoolExecutor(max_workers=PARSE_WORKERS) as parsers, json_array_writer(outfile) as write, \
+            shelve.open(CACHE_FILE) as cache:
+        while not finished:
+            # Fetch a batch of pages concurrently, parse them across CPU cores, then write them in page order
+            batch = range(page, page + CONCURRENT_PAGES)
+            keys = [f"{url}?page={p}" for p in batch]
+            # Entries written by another version of the parsers are ignored, so those pages are fetched again
+            cached = [entry[1:] if entry[0] == CACHE_VERSION else (None, None)
+                      for entry in (cache.get(key, (None, None, None)) for key in keys)]
+            responses, error = fetch_batch(pool, partial(fetch_page, session, url), batch, [etag for etag, _ in cached])
+
+            # Only pages that changed since the last run need parsing
+            parsed = parsers.map(partial(parse_page, parse_block=parse_block),
+                                 [content for _, content in responses if content is not None])
+            downloaded = False
+            for p, key, (etag, content), (_, cached_records) in zip(batch, keys, responses, cached):
+                if content is None:
+                    records = cached_records
+                else:
+                    downloaded = True
+                    records = next(parsed)
+                    if etag and records is not None:
+                        cache[key] = (CACHE_VERSION, etag, records)
 
-        print(f"Page {page}: collected {len(headers)} programs")
-        page += 1
-        time.sleep(randint(2, 5))  # Add some random delay to be more polite to the server
+                if records is None:
+                    finished = True
+                    break
 
-    print(f"Total programs collected: {len(programs)}")
-    with open('programs.json', 'w', encoding='utf-8') as f:
-        json.dump(programs, f, ensure_ascii=False, indent=4)
-        f.write("\n")
+                for record in records:
+                    write(record)
+                total += len(records)
+
+                print(f"Page {p}: collected {len(records)} {label}")
+
+            if not finished:
+                if error is not None:
+                    # A page before the end of the results could not be fetched
+                    raise error
+                page = batch.stop
+                if downloaded:  # Revalidated (304) pages cost the server next to nothing
+                    time.sleep(randint(2, 5))  # Add some random delay to be more polite to the server
+
+    print(f"Total {label} collected: {total}")
     
-    return programs
+    return total
+
+def scrape_courses():
+    return scrape(COURSE_URL, parse_course_block, 'courses.json', "courses")
+
+def scrape_programs():
+    return scrape(PROGRAM_URL, parse_program_block, 'programs.json', "programs")
 
 def main():
     parser = argparse.ArgumentParser(description='Scrape UofT Arts & Science Calendar for courses and/or programs.')
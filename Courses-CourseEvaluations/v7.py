@@ -6,24 +6,420 @@ Improved pagination handling to avoid duplicate data when reaching the last page
 """
 
 import time
-import json
+import os
+import queue
+import atexit
 import csv
+import gzip
+import hashlib
 import re
+import sqlite3
+import zlib
 import traceback
+import logging
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import orjson
+from lxml import etree, html
+
+# Per-row output from the extraction loop goes through logging so it costs nothing unless DEBUG is on
+logger = logging.getLogger(__name__)
+
+# Text that only shows up in the evaluation data table (course codes, terms, column names)
+DATA_TABLE_PATTERNS = ['AFR', 'ANA', 'ANT', 'Fall', 'Winter', 'Instructor', 'Course', 'Dept']
+# Any of them, matched in a single scan of the table text (also valid as a JavaScript RegExp)
+DATA_TABLE_RE = re.compile("|".join(DATA_TABLE_PATTERNS))
+# Column names that mark a header row
+HEADER_ROW_RE = re.compile(r"dept|course|instructor|term")
+# Content checks run against the lower-cased text of the whole table
+INSTRUCTOR_RATINGS_RE = re.compile(r"ins[123]|instructor")
+COURSE_RATINGS_RE = re.compile(r"artsc|course|rating|evaluation")
+RESPONSE_COUNTS_RE = re.compile(r"invited|responses|number|size")
+# Expanded header keywords to handle different divisions
+HEADER_KEYWORDS = frozenset([
+    'dept', 'course', 'instructor', 'term', 'year', 'name', 'division',
+    'ins1', 'ins2', 'ins3', 'ins4', 'ins5', 'ins6',
+    'artsc1', 'artsc2', 'artsc3', 'artsc4', 'artsc5', 'artsc6',
+    'number', 'invited', 'responses', 'response', 'size',
+    'first', 'last', 'faculty', 'school', 'program',
+    'evaluation', 'rating', 'score', 'mean', 'average',
+    'section', 'class', 'enrollment'
+])
+# Any of them as a substring, found in a single scan of the cell text
+HEADER_KEYWORDS_RE = re.compile("|".join(re.escape(keyword) for keyword in HEADER_KEYWORDS))
+# Column names that show up as cell text in repeated header rows, matched exactly or as a substring
+HEADER_INDICATORS = frozenset([
+    'dept', 'department', 'division', 'course', 'subject', 'code',
+    'last name', 'first name', 'instructor', 'term', 'year', 'semester',
+    'number', 'invited', 'responses', 'evaluation', 'rating', 'mean'
+])
+HEADER_INDICATORS_RE = re.compile("|".join(re.escape(indicator) for indicator in HEADER_INDICATORS))
+# Term names, which count as data rather than header text
+SEMESTERS = frozenset(['Fall', 'Winter', 'Summer', 'Spring'])
+# Department prefixes that, together with a digit, mark a cell as a course code rather than a header
+DEPT_PREFIX_RE = re.compile(r"AFR|ANA|ANT|AST|BCH|BIO|CHM|CSC|ECO|ENG|HIS|MAT|PHY|PSY|SOC", re.IGNORECASE)
+DIGIT_RE = re.compile(r"\d")
+# Cell value patterns used to tell data rows from header rows, checked for every row
+COURSE_CODE_RE = re.compile(r'^[A-Z]{3}\d+[A-Z]?\d?$')
+DECIMAL_RE = re.compile(r'^\d+\.\d+$')
+DEPT_RE = re.compile(r'^[A-Z]{2,5}$')
+COURSE_RE = re.compile(r'^[A-Z]{2,5}\d+[A-Z]?\d*$')
+NAME_RE = re.compile(r"^[A-Za-z\s'\-\.]+$")
+NUMBER_RE = re.compile(r'^\d+\.?\d*$')
+# How often the wait conditions below are polled, in seconds
+POLL_INTERVAL = 0.2
+# Longest a navigation or reload may block, in seconds; the grid waits decide when the page is usable
+PAGE_LOAD_TIMEOUT = 20
+# pageMax entry of the page input's onkeypress handler, with single or double quotes
+PAGE_MAX_RE = re.compile(r"""['"]pageMax['"]:\s*['"](\d+)['"]""")
+# Time the page size selector gets to fill in on its own before its loaders are poked,
+# and the overall time it gets
+PAGE_SIZE_POPULATE_GRACE = 4
+PAGE_SIZE_POPULATE_TIMEOUT = 20
+# Page size <select> lookups, most specific first
+PAGE_SIZE_SELECTORS = [
+    "#fbvGridPageSizeSelectBlock select",
+    ".pageSizeSelectWrapper select",
+    ".select-pageSize select",
+    "#fbvGridPageSizeSelectLvl1 select",
+    "select[name*='pagesize' i]",
+    "select[id*='pagesize' i]",
+    "select[onchange*='pagesize' i]"
+]
+# URLs scraped side by side by __main__, each worker process driving its own browser
+SCRAPE_WORKERS = 4
+# Browsers started by __main__ are headless unless UOFT_SCRAPER_HEADLESS=0 (to watch them while debugging)
+HEADLESS = os.environ.get("UOFT_SCRAPER_HEADLESS", "1") != "0"
+# Pages appended to the incremental files between flushes and manifest rewrites
+FLUSH_EVERY = 10
+# Buffer size of the incremental files, roughly FLUSH_EVERY full pages of records
+WRITE_BUFFER_SIZE = 1 << 20
+# Results of earlier runs, reused for CACHE_TTL seconds unless a rescrape is forced
+CACHE_DB = "course_evaluation_cache.sqlite"
+CACHE_TTL = 7 * 24 * 60 * 60
+# Third-party tracking hosts that have nothing to do with the evaluation data
+ANALYTICS_HOSTS = ['www.google-analytics.com', 'www.googletagmanager.com', 'stats.g.doubleclick.net']
+# Requests blocked through the DevTools protocol: analytics, ads, web fonts, stylesheets and
+# images. Chrome no longer honours the stylesheet content setting, so CSS is only blocked here;
+# images are also kept out by the content setting in tabs the blocking doesn't reach
+BLOCKED_URL_PATTERNS = ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+                        '*adobedtm.com*', '*.woff*', '*.ttf*', '*.css*',
+                        '*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.svg*']
+
+
+class DataTableReady:
+    """
+    WebDriverWait condition: a table with more than min_rows rows whose text matches
+    the data table pattern. Row counts and text of every table are checked
+    in a single script call per poll.
+    
+    Returns the table WebElement once it is ready, False otherwise
+    """
+    SCRIPT = """
+        var minRows = arguments[0], pattern = new RegExp(arguments[1]);
+        var tables = document.getElementsByTagName('table');
+        for (var i = 0; i < tables.length; i++) {
+            if (tables[i].getElementsByTagName('tr').length <= minRows) continue;
+            if (pattern.test(tables[i].innerText)) return tables[i];
+        }
+        return null;
+    """
+    
+    def __init__(self, min_rows, pattern=DATA_TABLE_RE):
+        self.min_rows = min_rows
+        self.pattern = pattern.pattern
+    
+    def __call__(self, driver):
+        return driver.execute_script(self.SCRIPT, self.min_rows, self.pattern) or False
+
+
+class PagingInputValue:
+    """
+    WebDriverWait condition: the grid's page number input shows the expected page,
+    i.e. the grid has been re-rendered after a page change
+    """
+    SCRIPT = """
+        var input = document.getElementById('gridPaging__getFbvGrid');
+        return input ? input.value : null;
+    """
+    
+    def __init__(self, expected_page):
+        self.expected_page = str(expected_page)
+    
+    def __call__(self, driver):
+        return driver.execute_script(self.SCRIPT) == self.expected_page
+
+
+
+class ElementPopulated:
+    """
+    WebDriverWait condition: the element with the given id exists and has non-blank
+    content, e.g. a container the page fills in with JavaScript after loading.
+    
+    Returns the element's innerHTML once it is populated, False otherwise
+    """
+    SCRIPT = """
+        var element = document.getElementById(arguments[0]);
+        return element && element.innerHTML.trim() ? element.innerHTML : null;
+    """
+    
+    def __init__(self, element_id):
+        self.element_id = element_id
+    
+    def __call__(self, driver):
+        return driver.execute_script(self.SCRIPT, self.element_id) or False
+
+
+class PageSizeRefreshed:
+    """
+    WebDriverWait condition: the grid has re-rendered after a page size change, i.e. the
+    page has more table rows than before, or the page size select has been replaced
+    (it no longer carries the marker MARK_SCRIPT put on the old one). Rows and the select
+    are checked in a single script call per poll, and only once a MutationObserver set up
+    by MARK_SCRIPT has seen the page change; until then a poll is a flag read.
+    
+    Returns [new page size select value] once refreshed (the value is None if the select
+    is gone), False otherwise
+    """
+    # Marks the page size select, starts watching the page for changes and returns the
+    # page's row count, before the change
+    MARK_SCRIPT = """
+        arguments[0].scraperPageSizeMark = true;
+        if (window.scraperDomObserver) window.scraperDomObserver.disconnect();
+        window.scraperDomChanged = false;
+        window.scraperDomObserver = new MutationObserver(function () { window.scraperDomChanged = true; });
+        window.scraperDomObserver.observe(document.body, {childList: true, subtree: true});
+        return document.getElementsByTagName('tr').length;
+    """
+    SCRIPT = """
+        var rowsBefore = arguments[0], selectors = arguments[1], select = null;
+        if (window.scraperDomObserver) {
+            if (!window.scraperDomChanged) return null;
+            // Cleared before looking, so a change made after this check is seen by the next poll
+            window.scraperDomChanged = false;
+        }
+        for (var i = 0; i < selectors.length && !select; i++) select = document.querySelector(selectors[i]);
+        if (document.getElementsByTagName('tr').length > rowsBefore || !select || !select.scraperPageSizeMark) {
+            if (window.scraperDomObserver) window.scraperDomObserver.disconnect();
+            window.scraperDomObserver = null;
+            return [select ? select.value : null];
+        }
+        return null;
+    """
+    
+    def __init__(self, rows_before):
+        self.rows_before = rows_before
+    
+    def __call__(self, driver):
+        return driver.execute_script(self.SCRIPT, self.rows_before, PAGE_SIZE_SELECTORS) or False
+
+
+# Rows of a table, including those in thead/tbody/tfoot
+TABLE_ROWS_XPATH = etree.XPath(".//tr")
+# Header and data cells of a row
+ROW_CELLS_XPATH = etree.XPath("./th|./td")
+# Elements laid out on lines of their own, so Selenium's .text sets their text apart with line breaks
+BLOCK_TAGS = ('address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption',
+              'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main',
+              'nav', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul')
+# Nodes whose text Selenium's rendered .text leaves out: scripts, styles and hidden elements
+HIDDEN_NODES_XPATH = etree.XPath(
+    ".//script|.//style|.//noscript|.//template|.//*[@hidden]"
+    "|.//*[contains(translate(@style, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ ', 'abcdefghijklmnopqrstuvwxyz'), 'display:none')]"
+)
+# Tables with more than 5 rows whose text contains any of the given patterns, best first.
+# Scored by patterns matched times own rows, so a layout table wrapping the data table
+# (whose rows it only contains indirectly) ranks below it
+DATA_TABLE_CANDIDATES_SCRIPT = """
+    var patterns = arguments[0], tables = document.getElementsByTagName('table'), candidates = [];
+    for (var i = 0; i < tables.length; i++) {
+        if (tables[i].getElementsByTagName('tr').length <= 5) continue;
+        var text = tables[i].innerText, matched = 0;
+        for (var j = 0; j < patterns.length; j++) {
+            if (text.indexOf(patterns[j]) !== -1) matched++;
+        }
+        if (matched) candidates.push([matched * tables[i].rows.length, i]);
+    }
+    candidates.sort(function (a, b) { return b[0] - a[0]; });
+    return candidates.map(function (candidate) { return tables[candidate[1]]; });
+"""
+# First button matched by a list of XPath expressions (tried in order), returned together
+# with its disabled state and onclick handler as [button, disabled, onclick]
+FIND_BUTTON_SCRIPT = """
+    var xpaths = arguments[0];
+    for (var i = 0; i < xpaths.length; i++) {
+        var match = document.evaluate(xpaths[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (match) return [match, match.disabled, match.getAttribute('onclick')];
+    }
+    return [null, true, null];
+"""
+# Everything _get_pagination_info reads from the paging bar, in one round trip:
+# [page input value, its onkeypress handler, bar text, next enabled, prev enabled], or
+# null when there is no paging bar. Missing inputs/buttons come back as null
+PAGINATION_STATE_SCRIPT = """
+    var container = document.getElementById('fbvGridPagingContentHolderLvl1');
+    if (!container) return null;
+    var input = container.querySelector('#gridPaging__getFbvGrid');
+    var enabled = function (value) {
+        var button = container.querySelector("input[type='button'][value='" + value + "']");
+        return button ? !button.disabled : null;
+    };
+    return [input ? input.value : null, input ? input.getAttribute('onkeypress') : null,
+            container.innerText, enabled('>'), enabled('<')];
+"""
+# First element matched by a list of CSS selectors (tried in order), returned together
+# with its value and the index of the selector as [element, value, index], or null if none matches
+FIND_FIRST_SCRIPT = """
+    var selectors = arguments[0];
+    for (var i = 0; i < selectors.length; i++) {
+        var match = document.querySelector(selectors[i]);
+        if (match) return [match, match.value, i];
+    }
+    return null;
+"""
+# Every <select> on the page (or just the one passed in) with its value and options, as
+# [select, value, [[option, option value, option text], ...]]
+SELECT_OPTIONS_SCRIPT = """
+    var selects = arguments.length ? [arguments[0]] : document.getElementsByTagName('select');
+    return Array.prototype.map.call(selects, function (select) {
+        return [select, select.value, Array.prototype.map.call(select.options, function (option) {
+            return [option, option.value, option.text.trim()];
+        })];
+    });
+"""
+# outerHTML of the element at an XPath (as made by ELEMENT_XPATH_SCRIPT), or null if there is none
+ELEMENT_HTML_SCRIPT = """
+    var element = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return element ? element.outerHTML : null;
+"""
+# Absolute XPath of an element, anchored at the closest ancestor with an id
+ELEMENT_XPATH_SCRIPT = """
+    var element = arguments[0], path = '';
+    for (; element && element.nodeType === 1; element = element.parentNode) {
+        if (element.id) return '//*[@id="' + element.id + '"]' + path;
+        var index = 1;
+        for (var sibling = element.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+            if (sibling.tagName === element.tagName) index++;
+        }
+        path = '/' + element.tagName.toLowerCase() + '[' + index + ']' + path;
+    }
+    return path;
+"""
+# Text of the first element matched by the first selector whose match has any text, or null
+PAGE_HEADER_SCRIPT = """
+    var selectors = arguments[0];
+    for (var i = 0; i < selectors.length; i++) {
+        var match = document.querySelector(selectors[i]);
+        var text = match ? match.innerText.trim() : '';
+        if (text) return text;
+    }
+    return null;
+"""
+
+
+# Idle browsers handed back by pooled scrapers, one queue per headless setting
+_driver_pools = {True: queue.Queue(), False: queue.Queue()}
+# ChromeDriver binary, resolved once per process (or taken from CHROMEDRIVER_PATH)
+_chromedriver_path = os.environ.get("CHROMEDRIVER_PATH")
+
+
+def close_driver_pool():
+    """Quit every idle pooled browser"""
+    for pool in _driver_pools.values():
+        while not pool.empty():
+            pool.get_nowait().quit()
+
+
+atexit.register(close_driver_pool)
+
+
+@lru_cache(maxsize=64)
+def key_field_columns(columns):
+    """
+    Find the department, course and name columns among a row's column names, trying
+    different possible names for each (the last matching column wins)
+    
+    Returns:
+        tuple: (dept, course, name) column names, None where there is no such column
+    """
+    dept = course = name = None
+    for column in columns:
+        column_lower = column.lower()
+        if 'dept' in column_lower or 'department' in column_lower:
+            dept = column
+        elif 'course' in column_lower or 'subject' in column_lower:
+            course = column
+        elif 'name' in column_lower or 'instructor' in column_lower:
+            name = column
+    return dept, course, name
+
+
+@lru_cache(maxsize=8192)
+def looks_like_data(text):
+    """
+    Check if text looks like actual data rather than a header (cell texts such as
+    terms and course codes repeat across tables, so results are kept)
+    """
+    if not text:
+        return False
+    # Check for course code patterns (three capitals and at least one digit)
+    if len(text) >= 4 and text[0].isupper() and COURSE_CODE_RE.match(text):
+        return True
+    # Check for numeric patterns
+    if text.isdigit() or ('.' in text and DECIMAL_RE.match(text)):
+        return True
+    # Check for semester patterns
+    return text in SEMESTERS
+
+
+def block_requests(driver):
+    """Drop the requests matching BLOCKED_URL_PATTERNS in the driver's current tab before they are sent"""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+
+
+def rendered_text(cell):
+    """
+    Text of a parsed table cell as Selenium's .text renders it: a line break at each <br> and
+    around block elements, whitespace collapsed within each line and blank lines dropped
+    """
+    if not len(cell):
+        return " ".join((cell.text or "").split())
+    for element in cell.iter('br', *BLOCK_TAGS):
+        element.tail = "\n" + (element.tail or "")
+        if element.tag != 'br':
+            element.text = "\n" + (element.text or "")
+    lines = (" ".join(line.split()) for line in cell.text_content().split("\n"))
+    return "\n".join(line for line in lines if line)
 
 
 class UofTCourseEvaluationScraper:
-    def __init__(self, headless=True, wait_time=10, max_pages=None):
+    @classmethod
+    def from_pool(cls, headless=True, wait_time=10):
+        """
+        Create a scraper that borrows an idle browser from the process-wide pool (starting
+        one only if none is free) and hands it back on close instead of quitting it
+        """
+        try:
+            driver = _driver_pools[headless].get_nowait()
+        except queue.Empty:
+            driver = None
+        scraper = cls(headless=headless, wait_time=wait_time, driver=driver)
+        scraper._pooled = True
+        return scraper
+    
+    def __init__(self, headless=True, wait_time=10, max_pages=None, driver=None):
         """
         Initialize the scraper with Chrome driver
         
@@ -31,13 +427,39 @@ class UofTCourseEvaluationScraper:
             headless (bool): Run browser in headless mode
             wait_time (int): Maximum wait time for elements to load
             max_pages (int, optional): DEPRECATED - No longer used, kept for backward compatibility
+            driver (WebDriver, optional): Already running browser to use instead of starting one
         """
         self.wait_time = wait_time
         self.max_pages = max_pages  # Kept for backward compatibility but no longer used
-        self.driver = self._setup_driver(headless)
+        self.headless = headless
+        self._pooled = False
+        self.driver = driver or self._setup_driver(headless)
         self.wait = WebDriverWait(self.driver, wait_time)
         self.url = None
-        self.base_filename = f"course_evaluation_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Scrapers running in other processes share the cache file: wait for each other's writes
+        # rather than failing with "database is locked", and let reads go on during them (WAL)
+        self.cache = sqlite3.connect(CACHE_DB, timeout=30)
+        self.cache.execute("PRAGMA journal_mode=WAL")
+        self.cache.execute("CREATE TABLE IF NOT EXISTS evaluations (url TEXT PRIMARY KEY, scraped_at INTEGER, payload BLOB)")
+        self.reset_state()
+        
+    def reset_state(self, name=None):
+        """
+        Start a fresh result set (and output files) for the next URL, keeping the browser
+        
+        Args:
+            name (str, optional): Included in the output filenames, to keep them apart from
+                those of scrapers running at the same time
+        """
+        # Pagination info of the currently rendered grid, reset whenever the grid reloads
+        self._pagination_info = None
+        # XPath and headers of the data table, found on the first page and reused on the rest,
+        # along with the index of its header row and that row's cell count (to check it is still there)
+        self._data_table_xpath = None
+        self._data_table_headers = None
+        self._data_table_header_row = None
+        prefix = f"course_evaluation_{name}_" if name else "course_evaluation_"
+        self.base_filename = f"{prefix}{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.all_data = []
         # Initialize the combined data structure
         self.combined_data = {
@@ -64,43 +486,157 @@ class UofTCourseEvaluationScraper:
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
         
-        # Use webdriver-manager to automatically handle ChromeDriver
-        service = Service(ChromeDriverManager().install())
+        # Only the data table is read, so skip downloading images, stylesheets and fonts
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.default_content_setting_values.fonts": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
+        # Images are also kept out of layout, so nothing is decoded or painted for them
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        # Analytics hosts never resolve, so their scripts can't hold up the page
+        chrome_options.add_argument("--host-resolver-rules=" + ", ".join(f"MAP {host} ~NOTFOUND" for host in ANALYTICS_HOSTS))
+        # Return from driver.get right away instead of waiting for the load event (third-party
+        # scripts can hold it up long after the grid is usable); the grid is waited for explicitly
+        chrome_options.page_load_strategy = 'none'
+        
+        # Use webdriver-manager to automatically handle ChromeDriver (its version check only needs to run once)
+        global _chromedriver_path
+        if not _chromedriver_path:
+            # Imported here: it is not needed at all when CHROMEDRIVER_PATH is set
+            from webdriver_manager.chrome import ChromeDriverManager
+            _chromedriver_path = ChromeDriverManager().install()
+        service = Service(_chromedriver_path)
         driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        
+        # Drop tracker, web font, stylesheet and image requests before they are sent. This only
+        # covers the tab the driver starts in (scrape_many repeats it in the tabs it opens); the
+        # host resolver rules above apply to every tab
+        block_requests(driver)
         return driver
     
-    def scrape_course_evaluation(self, url):
+    def _get_cached(self, url):
+        """Return the stored result for url if it was scraped within CACHE_TTL, else None"""
+        row = self.cache.execute("SELECT scraped_at, payload FROM evaluations WHERE url = ?", (url,)).fetchone()
+        if row and time.time() - row[0] < CACHE_TTL:
+            return orjson.loads(zlib.decompress(row[1]))
+        return None
+    
+    def _store_cached(self, url, data):
+        """Save a scraped result for later runs"""
+        payload = zlib.compress(orjson.dumps(data))
+        try:
+            with self.cache:
+                self.cache.execute("INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?)", (url, int(time.time()), payload))
+        except sqlite3.Error as e:
+            # The scrape itself is done and written out; only the next run's shortcut is lost
+            print(f"Could not cache results for {url}: {e}")
+    
+    def scrape_many(self, urls, force_rescrape=False):
+        """
+        Scrape several course evaluation pages with one browser. Every URL is opened
+        in its own tab up front so the initial page loads happen in parallel, then the
+        tabs are scraped one at a time
+        
+        Args:
+            urls (list): URLs of the course evaluation pages
+            force_rescrape (bool): Ignore results cached by earlier runs
+            
+        Returns:
+            dict: Scraped data for each URL (None where scraping failed)
+        """
+        original_tab = self.driver.current_window_handle
+        results = {}
+        tabs = {}
+        for url in urls:
+            cached = None if force_rescrape else self._get_cached(url)
+            if cached:
+                print(f"Using cached results for {url}")
+                results[url] = cached
+                continue
+            # window.open returns immediately, unlike driver.get which waits for the page
+            known_tabs = set(self.driver.window_handles)
+            self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+            tabs[url] = (set(self.driver.window_handles) - known_tabs).pop()
+        
+        for index, (url, tab) in enumerate(tabs.items(), 1):
+            self.driver.switch_to.window(tab)
+            # The tab's first load happened before it could be set up, but its postbacks are blocked as usual
+            block_requests(self.driver)
+            # Tabs can finish within the same second, so name their files after the URL (as __main__ does)
+            url_identifier = url.split('blockid=')[1][:10] if 'blockid=' in url else str(index)
+            self.reset_state(url_identifier)
+            results[url] = self.scrape_course_evaluation(url, load_page=False, force_rescrape=True)
+            self.driver.close()
+        
+        self.driver.switch_to.window(original_tab)
+        return results
+    
+    def scrape_course_evaluation(self, url, load_page=True, force_rescrape=False):
         """
         Scrape course evaluation data from the given URL
         
         Args:
             url (str): URL of the course evaluation page
+            load_page (bool): Navigate to the URL first; False if the current tab already shows it
+            force_rescrape (bool): Ignore results cached by earlier runs
             
         Returns:
             dict: Scraped course evaluation data
         """
+        if not force_rescrape:
+            cached = self._get_cached(url)
+            if cached:
+                print(f"Using cached results for {url} (scraped at {cached['page_info']['scraped_at']})")
+                self.combined_data = cached
+                return cached
+        
         print(f"Scraping course evaluation from: {url}")
         try:
-            self.driver.get(url)
+            if load_page:
+                # driver.get returns before the new document exists (page load strategy 'none'),
+                # and a reused scraper may still show another evaluation grid, so wait for the
+                # old document to go away before the grid waits below can be trusted
+                old_page = self.driver.find_element(By.TAG_NAME, "html")
+                try:
+                    self.driver.get(url)
+                except TimeoutException:
+                    # A slow third-party resource, not the grid; the waits below tell if it rendered
+                    print(f"Page load timed out after {PAGE_LOAD_TIMEOUT}s, checking for the table anyway...")
+                try:
+                    WebDriverWait(self.driver, self.wait_time, poll_frequency=POLL_INTERVAL).until(EC.staleness_of(old_page))
+                except TimeoutException:
+                    print("Warning: Previous page is still showing, waiting for the grid anyway")
             # Wait for page to load completely - improved wait for data table
             print("Waiting for page to load completely...")
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
+            try:
+                # The grid is ready once both the table and its page number input are in the DOM
+                self.wait.until(EC.all_of(
+                    EC.presence_of_element_located((By.TAG_NAME, "table")),
+                    EC.presence_of_element_located((By.ID, "gridPaging__getFbvGrid"))
+                ))
+            except TimeoutException:
+                # Some datasets may not have pagination at all; the table is what matters
+                print("Page input not found, waiting for the table only...")
+                self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
             
             # Set maximum page size first to reduce the number of pages to scrape
             page_size_changed = self._set_max_page_size()
-            # Additional wait for dynamic content and data table to fully load
-            # Wait longer if page size was changed to allow table refresh
-            if page_size_changed:
-                print("Page size was changed, waiting for table to refresh...")
-                time.sleep(5)  # Extra wait for table refresh
-            
+            self._reset_pagination_state()
+            # Wait for the data table to fully load (expecting more rows if the page size was changed)
             self._wait_for_data_table_to_load(page_size_changed)
             
             # Initialize combined_data URL
             self.combined_data['page_info']['source_url'] = url
             
-            # Get all data using fixed pagination approach
-            all_table_data = self._scrape_all_pages_fixed()
+            # Get all data using fixed pagination approach, writing each page out as it comes in
+            self._open_incremental_files()
+            try:
+                self._scrape_all_pages_fixed()
+            finally:
+                self._close_incremental_files()
             
             # Extract page metadata
             page_metadata = self._extract_page_info()
@@ -108,8 +644,11 @@ class UofTCourseEvaluationScraper:
             # Add additional metadata to page_info
             for key, value in page_metadata.items():
                 self.combined_data['page_info'][key] = value
+            self._write_combined_json()
             # The combined_data structure is already updated throughout scraping
             # by the save_incremental_data method, just return it
+            if self.combined_data['evaluation_data']:
+                self._store_cached(url, self.combined_data)
             return self.combined_data
         except Exception as e:
             print(f"Error scraping course evaluation: {str(e)}")
@@ -123,58 +662,37 @@ class UofTCourseEvaluationScraper:
         might be loaded dynamically via JavaScript.
         
         Args:
-            page_size_changed (bool): If True, wait longer for table refresh
+            page_size_changed (bool): If True, expect a larger table
         """
         print("Waiting for data table to fully load...")
         
-        max_attempts = 7 if page_size_changed else 5
-        attempt = 1
-        initial_wait = 5 if page_size_changed else 3
+        expected_min_rows = 10 if page_size_changed else 5  # Expect more rows if page size was increased
         
-        while attempt <= max_attempts:
-            try:
-                # Wait a bit for dynamic content to load
-                time.sleep(initial_wait if attempt == 1 else 3)
-                
-                # Find all tables
-                tables = self.driver.find_elements(By.TAG_NAME, "table")
-                print(f"Attempt {attempt}: Found {len(tables)} table(s)")
-                
-                # Look for the table with substantial rows (the data table)
-                data_table_found = False
-                for i, table in enumerate(tables):
-                    try:
-                        rows = table.find_elements(By.TAG_NAME, "tr")
-                        expected_min_rows = 10 if page_size_changed else 5  # Expect more rows if page size was increased
-                        
-                        if len(rows) > expected_min_rows:  # Must have substantial data
-                            table_text = table.text.strip()
-                            # Check if it contains course data patterns
-                            if any(pattern in table_text for pattern in ['AFR', 'ANA', 'ANT', 'Fall', 'Winter', 'Instructor', 'Course', 'Dept']):
-                                print(f"Found data table {i+1} with {len(rows)} rows on attempt {attempt}")
-                                # Simplified validation: if we found a table with the right patterns and enough rows, consider it valid
-                                print(f"Data table {i+1} is ready with {len(rows)} rows")
-                                data_table_found = True
-                                break
-                    except Exception as e:
-                        print(f"Error checking table {i+1}: {e}")
-                        continue
-                
-                if data_table_found:
-                    print("Data table is fully loaded and validated!")
-                    return True
-                    
-                print(f"Data table not ready yet, waiting... (attempt {attempt}/{max_attempts})")
-                attempt += 1
-                
-            except Exception as e:
-                print(f"Error checking for data table on attempt {attempt}: {e}")
-                attempt += 1
-                time.sleep(2)
-        
-        print("Warning: Data table may not be fully loaded, but proceeding...")
-        return False
+        try:
+            WebDriverWait(self.driver, 15, poll_frequency=POLL_INTERVAL).until(
+                DataTableReady(expected_min_rows))
+            print(f"Data table is ready with more than {expected_min_rows} rows")
+            return True
+        except TimeoutException:
+            print("Warning: Data table may not be fully loaded, but proceeding...")
+            return False
         
+    def _refresh_page(self):
+        """
+        Reload the current page and wait until the old document is gone, so the waits that
+        follow can't be satisfied by the table of the page being replaced
+        """
+        old_page = self.driver.find_element(By.TAG_NAME, "html")
+        try:
+            self.driver.refresh()
+        except TimeoutException:
+            print(f"Reload timed out after {PAGE_LOAD_TIMEOUT}s, checking the page anyway...")
+        self._reset_pagination_state()
+        try:
+            WebDriverWait(self.driver, self.wait_time, poll_frequency=POLL_INTERVAL).until(EC.staleness_of(old_page))
+        except TimeoutException:
+            print("Warning: Page did not reload, retrying on the current one")
+    
     def scrape_first_page_with_retry(self):
         """
         Special method to handle first page scraping with retry logic
@@ -194,8 +712,7 @@ class UofTCourseEvaluationScraper:
                     if retry < max_retry_attempts - 1:
                         # Refresh page and try again
                         print("Refreshing page and retrying...")
-                        self.driver.refresh()
-                        time.sleep(5)
+                        self._refresh_page()
                         continue
                 
                 # Try to extract data
@@ -208,15 +725,13 @@ class UofTCourseEvaluationScraper:
                     print(f"No data extracted on attempt {retry + 1}")
                     if retry < max_retry_attempts - 1:
                         print("Refreshing page and retrying...")
-                        self.driver.refresh()
-                        time.sleep(5)
+                        self._refresh_page()
                         continue
             except Exception as e:
                 print(f"Error on first page attempt {retry + 1}: {e}")
                 if retry < max_retry_attempts - 1:
                     print("Refreshing page and retrying...")
-                    self.driver.refresh()
-                    time.sleep(5)
+                    self._refresh_page()
                     continue
                 else:
                     print("All retry attempts failed for first page")
@@ -225,14 +740,22 @@ class UofTCourseEvaluationScraper:
         print("Failed to extract data from first page after all retry attempts")
         return []
     
+    def _reset_pagination_state(self):
+        """Forget the cached pagination info after the grid has been reloaded"""
+        self._pagination_info = None
+    
     def _get_pagination_info(self):
         """
         Extract pagination information from the page, including current page and total pages
-        Uses the pageMax attribute and pagination structure for accurate detection
+        Uses the pageMax attribute and pagination structure for accurate detection.
+        The result is cached until the grid is reloaded (see _reset_pagination_state)
         
         Returns:
             dict: Dictionary containing current_page, total_pages, and other pagination info
         """
+        if self._pagination_info is not None:
+            return self._pagination_info
+        
         pagination_info = {
             'current_page': 1,
             'total_pages': 1,
@@ -241,13 +764,15 @@ class UofTCourseEvaluationScraper:
         }
         
         try:
-            # Try to find the pagination container
-            pagination_container = self.driver.find_element(By.ID, "fbvGridPagingContentHolderLvl1")
+            # Read the whole paging bar in one script call rather than a WebDriver request per field
+            state = self.driver.execute_script(PAGINATION_STATE_SCRIPT)
+            if state is None:
+                raise NoSuchElementException("Pagination container fbvGridPagingContentHolderLvl1 not found")
+            page_value, onkeypress_attr, pagination_text, next_enabled, prev_enabled = state
             
             # Look for the page input field that shows current page
             try:
-                page_input = pagination_container.find_element(By.ID, "gridPaging__getFbvGrid")
-                current_page = int(page_input.get_attribute("value"))
+                current_page = int(page_value)
                 pagination_info['current_page'] = current_page
                 print(f"Current page from input field: {current_page}")
             except Exception as e:
@@ -255,28 +780,18 @@ class UofTCourseEvaluationScraper:
             
             # Priority 1: Try to get pageMax from the onkeypress attribute (most reliable)
             try:
-                page_input = pagination_container.find_element(By.ID, "gridPaging__getFbvGrid")
-                onkeypress_attr = page_input.get_attribute("onkeypress")
                 if onkeypress_attr and "pageMax" in onkeypress_attr:
                     # Extract pageMax value using regex
-                    match = re.search(r"'pageMax':\s*'(\d+)'", onkeypress_attr)
+                    match = PAGE_MAX_RE.search(onkeypress_attr)
                     if match:
                         page_max = int(match.group(1))
                         pagination_info['total_pages'] = page_max
                         print(f"Total pages from pageMax attribute: {page_max}")
-                    else:
-                        # Try alternative pageMax pattern
-                        match = re.search(r'"pageMax":\s*"(\d+)"', onkeypress_attr)
-                        if match:
-                            page_max = int(match.group(1))
-                            pagination_info['total_pages'] = page_max
-                            print(f"Total pages from pageMax attribute (alt pattern): {page_max}")
             except Exception as e:
                 print(f"Could not get pageMax from onkeypress: {e}")
             
             # Priority 2: Look for the total pages indicator (text after " / ")
             try:
-                pagination_text = pagination_container.text
                 if " / " in pagination_text:
                     # Extract the number after " / " which represents total pages
                     parts = pagination_text.split(" / ")
@@ -295,24 +810,22 @@ class UofTCourseEvaluationScraper:
                 print(f"Could not get total pages from text: {e}")
             
             # Check if next/previous buttons are enabled
-            try:
-                next_button = pagination_container.find_element(By.XPATH, ".//input[@type='button' and @value='>']")
-                pagination_info['has_next'] = next_button.is_enabled()
+            if next_enabled is None:
+                print("Could not check next button status: no next button")
+            else:
+                pagination_info['has_next'] = next_enabled
                 
                 # Additional check: if current page equals total pages, we shouldn't have next
                 if pagination_info['current_page'] >= pagination_info['total_pages']:
                     pagination_info['has_next'] = False
                     print(f"Overriding has_next to False: current page {pagination_info['current_page']} >= total pages {pagination_info['total_pages']}")
-                    
-            except Exception as e:
-                print(f"Could not check next button status: {e}")
             
-            try:
-                prev_button = pagination_container.find_element(By.XPATH, ".//input[@type='button' and @value='<']")
-                pagination_info['has_prev'] = prev_button.is_enabled()
-            except Exception as e:
-                print(f"Could not check previous button status: {e}")
-                
+            if prev_enabled is None:
+                print("Could not check previous button status: no previous button")
+            else:
+                pagination_info['has_prev'] = prev_enabled
+            
+            self._pagination_info = pagination_info
         except Exception as e:
             print(f"Error getting pagination info: {e}")
         
@@ -326,7 +839,7 @@ class UofTCourseEvaluationScraper:
         Returns:
             list: Combined list of data from all pages
         """
-        all_data = []
+        all_data = self.combined_data['evaluation_data']
         
         # Get initial pagination info - this is crucial for determining total pages
         pagination_info = self._get_pagination_info()
@@ -342,20 +855,6 @@ class UofTCourseEvaluationScraper:
         while current_page <= total_pages:
             print(f"\n--- Processing Page {current_page}/{total_pages} ---")
             
-            # Get current pagination state before processing
-            current_pagination = self._get_pagination_info()
-            actual_current_page = current_pagination.get('current_page', current_page)
-            actual_total_pages = current_pagination.get('total_pages', total_pages)
-            
-            # Update our understanding if pagination info has changed
-            if actual_current_page != current_page:
-                print(f"Pagination state updated: now on page {actual_current_page} (expected {current_page})")
-                current_page = actual_current_page
-            
-            if actual_total_pages != total_pages:
-                print(f"Total pages updated: {actual_total_pages} (was {total_pages})")
-                total_pages = actual_total_pages
-            
             # Special handling for first page - ensure data table is loaded with retry logic
             if current_page == 1:
                 print("First page - ensuring data table is fully loaded with enhanced retry...")
@@ -366,7 +865,7 @@ class UofTCourseEvaluationScraper:
             
             if current_page_data:
                 # Create a hash of the data to detect duplicates
-                data_hash = hash(str(sorted([str(row) for row in current_page_data])))
+                data_hash = self._page_digest(current_page_data)
                 
                 if data_hash in previous_data_hashes:
                     print(f"DUPLICATE DATA DETECTED on page {current_page}! This indicates we've reached the end or there's a navigation issue.")
@@ -375,7 +874,6 @@ class UofTCourseEvaluationScraper:
                 
                 previous_data_hashes.add(data_hash)
                 print(f"Found {len(current_page_data)} records on page {current_page}")
-                all_data.extend(current_page_data)
                 self.save_incremental_data(current_page_data, current_page)
             else:
                 print(f"No data found on page {current_page}")
@@ -388,12 +886,13 @@ class UofTCourseEvaluationScraper:
                 break
             
             # Double-check pagination state before attempting navigation
-            pre_nav_pagination = self._get_pagination_info()
-            if not pre_nav_pagination.get('has_next', False):
+            # (only re-read if the first page was refreshed while retrying)
+            pagination_info = self._get_pagination_info()
+            if not pagination_info.get('has_next', False):
                 print("Next button not available before navigation - reached the end")
                 break
             
-            if pre_nav_pagination.get('current_page', current_page) >= pre_nav_pagination.get('total_pages', total_pages):
+            if pagination_info.get('current_page', current_page) >= pagination_info.get('total_pages', total_pages):
                 print("Already on last page according to pagination info - stopping")
                 break
             
@@ -405,19 +904,32 @@ class UofTCourseEvaluationScraper:
                 break
             
             # Verify we actually moved to a new page
-            post_nav_pagination = self._get_pagination_info()
-            new_page_number = post_nav_pagination.get('current_page', current_page)
+            pagination_info = self._get_pagination_info()
+            new_page_number = pagination_info.get('current_page', current_page)
             
             if new_page_number <= current_page:
                 print(f"Page number didn't increase after navigation (still {new_page_number}) - likely reached the end")
                 break
             
+            new_total_pages = pagination_info.get('total_pages', total_pages)
+            if new_total_pages != total_pages:
+                print(f"Total pages updated: {new_total_pages} (was {total_pages})")
+                total_pages = new_total_pages
+            
             # Update current page for next iteration
             current_page = new_page_number
         
         print(f"\nCompleted scraping all pages, found total {len(all_data)} records")
         return all_data
 
+    def _page_digest(self, page_data):
+        """Digest of a page's records, computed in one pass without building their string forms"""
+        digest = hashlib.blake2b(digest_size=16)
+        for row in page_data:
+            digest.update(orjson.dumps(row, option=orjson.OPT_SORT_KEYS))
+            digest.update(b'\n')
+        return digest.digest()
+    
     def _navigate_to_next_page(self, current_page, total_pages):
         """
         Navigate to the next page with robust error handling and verification
@@ -432,45 +944,27 @@ class UofTCourseEvaluationScraper:
         try:
             print(f"Attempting to navigate from page {current_page} to page {current_page + 1}")
             
-            # Find the next button using multiple strategies
-            next_button = None
-            
-            # Strategy 1: Find by onclick containing __getFbvGrid with the next page number
+            # Find the next button using multiple strategies, tried in order in a single call:
+            # 1. onclick calls __getFbvGrid with the next page number
+            # 2. any '>' button calling __getFbvGrid
+            # 3. any '>' button within the pagination container
             expected_next_page = current_page + 1
-            try:
-                next_button = self.driver.find_element(By.XPATH, f"//input[@type='button' and @value='>' and contains(@onclick, '__getFbvGrid({expected_next_page})')]")
-                print(f"Found next button with explicit page {expected_next_page}")
-            except NoSuchElementException:
-                pass
-            
-            # Strategy 2: Find any next button with '>' value
-            if not next_button:
-                try:
-                    next_button = self.driver.find_element(By.XPATH, "//input[@type='button' and @value='>' and contains(@onclick, '__getFbvGrid')]")
-                    print("Found next button with general selector")
-                except NoSuchElementException:
-                    pass
-            
-            # Strategy 3: Look within the pagination container
-            if not next_button:
-                try:
-                    pagination_container = self.driver.find_element(By.ID, "fbvGridPagingContentHolderLvl1")
-                    next_button = pagination_container.find_element(By.XPATH, ".//input[@type='button' and @value='>']")
-                    print("Found next button within pagination container")
-                except NoSuchElementException:
-                    pass
+            next_button, disabled, onclick_attr = self.driver.execute_script(FIND_BUTTON_SCRIPT, [
+                f"//input[@type='button' and @value='>' and contains(@onclick, '__getFbvGrid({expected_next_page})')]",
+                "//input[@type='button' and @value='>' and contains(@onclick, '__getFbvGrid')]",
+                "//*[@id='fbvGridPagingContentHolderLvl1']//input[@type='button' and @value='>']"
+            ])
             
             if not next_button:
                 print("Could not find next button")
                 return False
             
-            # Check if button is enabled
-            if not next_button.is_enabled():
+            # Check if button is enabled (read along with the lookup)
+            if disabled:
                 print("Next button is disabled")
                 return False
             
-            # Get the onclick attribute to understand what page it will navigate to
-            onclick_attr = next_button.get_attribute('onclick')
+            # The onclick attribute shows what page it will navigate to
             print(f"Next button onclick: {onclick_attr}")
             
             # Click the button
@@ -486,9 +980,16 @@ class UofTCourseEvaluationScraper:
                     print(f"Regular click also failed: {e2}")
                     return False
             
-            # Wait for page to load
+            # The grid re-renders its pagination controls along with the rows
+            self._reset_pagination_state()
+            
+            # Wait for the grid to show the new page number
             print("Waiting for page to load after navigation...")
-            time.sleep(4)  # Give time for the page to load
+            try:
+                WebDriverWait(self.driver, self.wait_time, poll_frequency=POLL_INTERVAL).until(
+                    PagingInputValue(expected_next_page))
+            except TimeoutException:
+                print(f"Warning: Page input did not switch to page {expected_next_page}")
             
             # Wait for the table to be present (indicating page has loaded)
             try:
@@ -503,10 +1004,49 @@ class UofTCourseEvaluationScraper:
             print(f"Error during navigation: {e}")
             return False
     
-    def _analyze_table_structure(self, table):
+    def _read_table_rows(self, table):
+        """
+        Read the text of every cell of a table. The table's markup is fetched in one
+        call and walked with lxml, so no further WebDriver requests are made
+        
+        Returns:
+            list: One (th_texts, td_texts) tuple per row, each a list of cell texts
+        """
+        return self._parse_table_rows(table.get_attribute('outerHTML'))
+    
+    def _parse_table_rows(self, markup):
+        """
+        Parse a table's outerHTML into its cell texts, see _read_table_rows
+        
+        Returns:
+            list: One (th_texts, td_texts) tuple per row, each a list of cell texts
+        """
+        doc = html.fromstring(markup)
+        # Drop what isn't rendered first (keeping the text that follows each node). Hidden rows
+        # and cells are still found by Selenium, just without text, so those are kept but blanked
+        hidden_cells = set()
+        for node in HIDDEN_NODES_XPATH(doc):
+            cells = list(node.iter('th', 'td'))
+            if cells:
+                hidden_cells.update(cells)
+            else:
+                node.drop_tree()
+        rows = []
+        for row in TABLE_ROWS_XPATH(doc):
+            th_cells, td_cells = [], []
+            for cell in ROW_CELLS_XPATH(row):
+                text = "" if cell in hidden_cells else rendered_text(cell)
+                (th_cells if cell.tag == 'th' else td_cells).append(text)
+            rows.append((th_cells, td_cells))
+        return rows
+    
+    def _analyze_table_structure(self, rows):
         """
         Analyze the table structure to understand column patterns
         This helps adapt to different evaluation formats
+        
+        Args:
+            rows (list): Table rows as returned by _read_table_rows
         """
         structure_info = {
             'total_columns': 0,
@@ -519,45 +1059,35 @@ class UofTCourseEvaluationScraper:
         
         try:
             # Get a sample of rows to analyze
-            rows = table.find_elements(By.TAG_NAME, "tr")[:10]  # First 10 rows
+            sample_rows = rows[:10]  # First 10 rows
             
             # Find the longest row (likely data row)
-            max_cols = 0
-            sample_row = None
-            for row in rows:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if len(cells) > max_cols:
-                    max_cols = len(cells)
-                    sample_row = row
-            
-            structure_info['total_columns'] = max_cols
+            structure_info['total_columns'] = max((len(td_cells) for th_cells, td_cells in sample_rows), default=0)
             
             # Analyze header patterns
-            header_row = None
-            for row in rows[:3]:  # Check first 3 rows for headers
-                cells = row.find_elements(By.TAG_NAME, "th") or row.find_elements(By.TAG_NAME, "td")
+            for th_cells, td_cells in sample_rows[:3]:  # Check first 3 rows for headers
+                cells = th_cells or td_cells
                 if cells:
-                    row_text = " ".join(cell.text.strip().lower() for cell in cells)
+                    row_text = " ".join(cell.lower() for cell in cells)
                     
                     # Check for common header patterns
-                    if any(pattern in row_text for pattern in ['dept', 'course', 'instructor', 'term']):
-                        header_row = row
-                        structure_info['detected_headers'] = [cell.text.strip() for cell in cells]
+                    if HEADER_ROW_RE.search(row_text):
+                        structure_info['detected_headers'] = list(cells)
                         break
             
             # Analyze content patterns from the table text
-            table_text = table.text.lower()
+            table_text = self._table_text(rows).lower()
             
             # Check for instructor rating patterns (INS1, INS2, etc.)
-            if any(pattern in table_text for pattern in ['ins1', 'ins2', 'ins3', 'instructor']):
+            if INSTRUCTOR_RATINGS_RE.search(table_text):
                 structure_info['has_instructor_ratings'] = True
             
             # Check for course rating patterns (ARTSC, course evaluation, etc.)
-            if any(pattern in table_text for pattern in ['artsc', 'course', 'rating', 'evaluation']):
+            if COURSE_RATINGS_RE.search(table_text):
                 structure_info['has_course_ratings'] = True
             
             # Check for response count patterns
-            if any(pattern in table_text for pattern in ['invited', 'responses', 'number', 'size']):
+            if RESPONSE_COUNTS_RE.search(table_text):
                 structure_info['has_response_counts'] = True
             
             # Try to determine division type based on content
@@ -577,105 +1107,117 @@ class UofTCourseEvaluationScraper:
         
         return structure_info
     
+    def _table_text(self, rows):
+        """Text of the whole table rebuilt from its rows, one line per row"""
+        return "\n".join(" ".join(th_cells + td_cells) for th_cells, td_cells in rows)
+    
     def _extract_main_table(self):
         """Extract the main course evaluation data table with enhanced column detection"""
         table_data = []
         
         try:
-            print("Looking for the main course evaluation table...")
-            
-            # Find all tables
-            tables = self.driver.find_elements(By.TAG_NAME, "table")
-            print(f"Found {len(tables)} table(s) on the page")
-            
-            # Strategy: Look for the table with actual course data
-            table_element = None
-            table_structure = None
-            for i, table in enumerate(tables):
-                try:
-                    rows = table.find_elements(By.TAG_NAME, "tr")
-                    print(f"Table {i+1}: {len(rows)} rows")
-                    
-                    if len(rows) > 5:  # Must have substantial data
-                        # Check first few rows for course data patterns
-                        table_text = table.text.strip()
-                        # Look for course codes like AFR, ANA, etc.
-                        if any(pattern in table_text for pattern in ['AFR', 'ANA', 'ANT', 'Fall', 'Winter', 'Instructor', 'Course', 'Dept']):
-                            print(f"Table {i+1} contains course evaluation data")
-                            print(f"Table {i+1} first 200 chars: {table_text[:200]}")
-                            
-                            # Analyze table structure
-                            table_structure = self._analyze_table_structure(table)
-                            
-                            # Try to find headers in multiple ways
-                            headers = self._extract_table_headers(table, rows, table_structure)
-                            
-                            if headers and len(headers) > 3:  # Must have meaningful headers
-                                table_element = table
-                                print(f"Selected table {i+1} with headers: {headers}")
-                                break
+            rows = None
+            headers = None
+            
+            # The data table keeps its place and columns across pagination, so once it has been
+            # found go straight to it; its structure and headers were worked out on the first page
+            if self._data_table_xpath:
+                # Looked up and snapshotted in a single call
+                markup = self.driver.execute_script(ELEMENT_HTML_SCRIPT, self._data_table_xpath)
+                table_rows = self._parse_table_rows(markup) if markup else None
+                if table_rows:
+                    rows = table_rows
+                    headers = self._data_table_headers
+                    print(f"Using previously located data table with headers: {headers}")
+                elif markup is None:
+                    print("Previously located data table is gone, searching again...")
+                    self._data_table_xpath = None
+                    self._data_table_header_row = None
+            
+            if rows is None:
+                print("Looking for the main course evaluation table...")
+                
+                # Score every table in the browser in one call: only tables with enough rows and
+                # course data patterns come back, the most likely data table first
+                tables = self.driver.execute_script(DATA_TABLE_CANDIDATES_SCRIPT, DATA_TABLE_PATTERNS)
+                print(f"Found {len(tables)} candidate table(s) on the page")
+                
+                # Strategy: Look for the table with actual course data
+                table_structure = None
+                for i, table in enumerate(tables):
+                    try:
+                        # All cell texts in one round trip; everything below works on this snapshot
+                        table_rows = self._read_table_rows(table)
+                        table_text = self._table_text(table_rows)
+                        print(f"Table {i+1}: {len(table_rows)} rows")
+                        print(f"Table {i+1} first 200 chars: {table_text[:200]}")
                         
-                except Exception as e:
-                    print(f"Error analyzing table {i+1}: {e}")
-                    continue
-            
-            if not table_element:
-                print("Could not find the main data table")
-                return table_data
-            
-            # Store table structure info
-            if table_structure:
-                self.combined_data['page_info']['table_structure'] = table_structure
+                        # Analyze table structure
+                        table_structure = self._analyze_table_structure(table_rows)
+                        
+                        # Try to find headers in multiple ways
+                        candidate_headers = self._extract_table_headers(table_rows, table_structure)
+                        
+                        if candidate_headers and len(candidate_headers) > 3:  # Must have meaningful headers
+                            rows = table_rows
+                            headers = candidate_headers
+                            self._data_table_xpath = self.driver.execute_script(ELEMENT_XPATH_SCRIPT, table)
+                            # A table found again may lay out its header differently, so look for it afresh
+                            self._data_table_header_row = None
+                            self._data_table_headers = list(headers)
+                            print(f"Selected table {i+1} with headers: {headers}")
+                            break
+                            
+                    except Exception as e:
+                        print(f"Error analyzing table {i+1}: {e}")
+                        continue
+                
+                if rows is None:
+                    print("Could not find the main data table")
+                    return table_data
+                
+                # Store table structure info
+                if table_structure:
+                    self.combined_data['page_info']['table_structure'] = table_structure
             
             # Extract table data with the found table
             print("Extracting data from the selected table...")
-            rows = table_element.find_elements(By.TAG_NAME, "tr")
             print(f"Table has {len(rows)} total rows")
-            
-            # Get headers
-            headers = self._extract_table_headers(table_element, rows, table_structure)
             print(f"Final headers ({len(headers)}): {headers}")
             
-            if not headers:
-                print("No valid headers found")
-                return table_data
-            
-            # Extract data rows
+            # Extract data rows. The header row stays put across pages, so only check that the row
+            # found on the first page still has the same number of cells
             data_rows_processed = 0
-            header_row_index = self._find_header_row_index(table_element, rows)
+            cached_header_row = self._data_table_header_row
+            if cached_header_row and len(rows) > cached_header_row[0] and \
+                    len(rows[cached_header_row[0]][0] or rows[cached_header_row[0]][1]) == cached_header_row[1]:
+                header_row_index = cached_header_row[0]
+            else:
+                header_row_index = self._find_header_row_index(rows)
+                if header_row_index < len(rows):
+                    th_cells, td_cells = rows[header_row_index]
+                    self._data_table_header_row = (header_row_index, len(th_cells or td_cells))
             print(f"Starting data extraction from row {header_row_index + 2} (after headers)")
             
-            for i, row in enumerate(rows[header_row_index + 1:], header_row_index + 1):
+            data_rows = rows[header_row_index + 1:]
+            
+            # Handle rows with more columns than headers by naming the extra columns up front,
+            # so every row maps onto the same full set of headers
+            n_cols = max([len(headers)] + [len(cells) for _, cells in data_rows])
+            if n_cols > len(headers):
+                headers = headers + [f"Column_{j+1}" for j in range(len(headers), n_cols)]
+                print(f"Extended headers to {n_cols} columns to fit the widest row")
+            
+            for i, (th_cells, cells) in enumerate(data_rows, header_row_index + 1):
                 try:
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    
                     if len(cells) > 0:
-                        row_data = {}
-                        
-                        # Handle cases where row has different number of columns than headers
-                        max_cols = max(len(cells), len(headers))
-                        
-                        # Ensure we have enough headers for all columns
-                        if len(headers) < max_cols:
-                            additional_headers = [f"Column_{j+1}" for j in range(len(headers), max_cols)]
-                            headers.extend(additional_headers)
-                            print(f"Extended headers to {len(headers)} columns for row with {len(cells)} cells")
-                        
-                        # Map each cell to its corresponding header
-                        for j, cell in enumerate(cells):
-                            header = headers[j] if j < len(headers) else f"Column_{j+1}"
-                            cell_text = cell.text.strip()
-                            row_data[header] = cell_text
-                        
-                        # Add empty values for missing columns if row has fewer cells than headers
-                        for j in range(len(cells), len(headers)):
-                            header = headers[j]
-                            row_data[header] = ""
+                        # Map each cell to its corresponding header, with empty values for missing
+                        # columns if the row has fewer cells than headers
+                        row_data = dict(zip(headers, cells + [""] * (n_cols - len(cells))))
                         
                         # Debug: Show first few rows being processed
-                        if data_rows_processed < 5:
-                            first_few_cells = {k: v for k, v in list(row_data.items())[:5]}
-                            print(f"Row {i}: {first_few_cells}")
+                        if data_rows_processed < 5 and logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Row %d: %s", i, dict(islice(row_data.items(), 5)))
                         
                         # Validate that this is actual course data, not headers or malformed data
                         if self._is_valid_course_data_row(row_data):
@@ -683,11 +1225,11 @@ class UofTCourseEvaluationScraper:
                             data_rows_processed += 1
                         else:
                             if data_rows_processed < 5:  # Only show rejections for first few rows
-                                print(f"  -> Row {i} rejected by validation")
+                                logger.debug("  -> Row %d rejected by validation", i)
                     
                     # Print progress for large tables
                     if i % 50 == 0 and i > 0:
-                        print(f"Processed {i} rows, extracted {data_rows_processed} data rows...")
+                        logger.debug("Processed %d rows, extracted %d data rows...", i, data_rows_processed)
                         
                 except Exception as e:
                     print(f"Error processing row {i}: {e}")
@@ -701,29 +1243,17 @@ class UofTCourseEvaluationScraper:
         
         return table_data
     
-    def _extract_table_headers(self, table, rows, structure_info=None):
+    def _extract_table_headers(self, rows, structure_info=None):
         """Extract headers from table using multiple strategies with dynamic column detection"""
         headers = []
+        # Column count of the widest of the first 5 rows, for the dynamic headers below
+        max_cols = max((len(td_cells) for th_cells, td_cells in rows[:5]), default=0)
         
         try:
             # Strategy 1: Look for TH elements in first few rows
-            for row_index in range(min(3, len(rows))):
-                row = rows[row_index]
-                th_cells = row.find_elements(By.TAG_NAME, "th")
-                
+            for row_index, (th_cells, td_cells) in enumerate(rows[:3]):
                 if th_cells:
-                    candidate_headers = []
-                    for cell in th_cells:
-                        text = cell.text.strip()
-                        # If text is empty, try to get it from child elements
-                        if not text:
-                            child_elements = cell.find_elements(By.XPATH, ".//*")
-                            for child in child_elements:
-                                child_text = child.text.strip()
-                                if child_text:
-                                    text = child_text
-                                    break
-                        candidate_headers.append(text if text else f"Column_{len(candidate_headers)+1}")
+                    candidate_headers = [text if text else f"Column_{j+1}" for j, text in enumerate(th_cells)]
                     
                     # Check if these look like valid headers
                     if candidate_headers and any(h for h in candidate_headers if len(h) > 0):
@@ -735,38 +1265,23 @@ class UofTCourseEvaluationScraper:
             if not headers or all(not h or h.startswith('Column_') for h in headers):
                 print("No TH headers found, trying TD headers...")
                 
-                for row_index in range(min(3, len(rows))):
-                    row = rows[row_index]
-                    td_cells = row.find_elements(By.TAG_NAME, "td")
-                    
+                for row_index, (th_cells, td_cells) in enumerate(rows[:3]):
                     if td_cells:
                         candidate_headers = []
                         valid_header_count = 0
                         
-                        for cell in td_cells:
-                            text = cell.text.strip()
-                            # Expanded header keywords to handle different divisions
-                            header_keywords = [
-                                'dept', 'course', 'instructor', 'term', 'year', 'name', 'division',
-                                'ins1', 'ins2', 'ins3', 'ins4', 'ins5', 'ins6',
-                                'artsc1', 'artsc2', 'artsc3', 'artsc4', 'artsc5', 'artsc6',
-                                'number', 'invited', 'responses', 'response', 'size',
-                                'first', 'last', 'faculty', 'school', 'program',
-                                'evaluation', 'rating', 'score', 'mean', 'average',
-                                'section', 'class', 'enrollment'
-                            ]
-                            
+                        for text in td_cells:
                             # Skip if this looks like actual data (e.g., course codes)
-                            if (any(pattern in text.upper() for pattern in ['AFR', 'ANA', 'ANT', 'AST', 'BCH', 'BIO', 'CHM', 'CSC', 'ECO', 'ENG', 'HIS', 'MAT', 'PHY', 'PSY', 'SOC']) 
-                                and any(char.isdigit() for char in text)):
+                            if DIGIT_RE.search(text) and DEPT_PREFIX_RE.search(text):
                                 # This looks like course data, not headers
                                 break
                             
                             # Check for header patterns
-                            if any(keyword in text.lower() for keyword in header_keywords):
+                            text_lower = text.lower()
+                            if HEADER_KEYWORDS_RE.search(text_lower):
                                 candidate_headers.append(text)
                                 valid_header_count += 1
-                            elif text and not text.isdigit() and len(text) > 1 and not self._looks_like_data(text):
+                            elif text and not text.isdigit() and len(text) > 1 and not looks_like_data(text):
                                 candidate_headers.append(text)
                             else:
                                 candidate_headers.append(f"Column_{len(candidate_headers)+1}")
@@ -781,64 +1296,40 @@ class UofTCourseEvaluationScraper:
             if not headers or len([h for h in headers if h and not h.startswith('Column_')]) < 3:
                 print("Using dynamic column detection for headers")
                 
-                # Count columns from the first data row
-                max_cols = 0
-                for row in rows[:5]:  # Check first 5 rows
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    max_cols = max(max_cols, len(cells))
-                
                 headers = [f"Column_{i+1}" for i in range(max_cols)]
                 print(f"Generated {max_cols} dynamic headers: {headers}")
             
         except Exception as e:
             print(f"Error extracting headers: {e}")
             # Fallback to dynamic column generation
-            try:
-                max_cols = 0
-                for row in rows[:5]:
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    max_cols = max(max_cols, len(cells))
-                headers = [f"Column_{i+1}" for i in range(max(max_cols, 15))]
-            except:
-                headers = [f"Column_{i+1}" for i in range(20)]  # Ultimate fallback
+            headers = [f"Column_{i+1}" for i in range(max(max_cols, 15))]
         
         return headers
     
-    def _looks_like_data(self, text):
-        """Check if text looks like actual data rather than a header"""
-        # Check for course code patterns
-        if re.match(r'^[A-Z]{3}\d+[A-Z]?\d?$', text):
-            return True
-        # Check for numeric patterns
-        if text.isdigit() or re.match(r'^\d+\.\d+$', text):
-            return True
-        # Check for semester patterns
-        if text in ['Fall', 'Winter', 'Summer', 'Spring']:
-            return True
-        return False
-    
-    def _find_header_row_index(self, table, rows):
-        """Find which row contains the headers"""
-        try:
-            # Look for row with TH elements
-            for i, row in enumerate(rows[:3]):
-                th_cells = row.find_elements(By.TAG_NAME, "th")
-                if th_cells:
-                    return i
-            
-            # Look for row with header-like content
-            for i, row in enumerate(rows[:3]):
-                td_cells = row.find_elements(By.TAG_NAME, "td")
-                if td_cells:
-                    row_text = row.text.strip().lower()
-                    if any(keyword in row_text for keyword in ['dept', 'course', 'instructor', 'term']):
-                        return i
-            
-            # Default to first row
-            return 0
-        except Exception as e:
-            print(f"Error finding header row: {e}")
-            return 0
+    def _find_header_row_index(self, rows):
+        """
+        Find which row contains the headers
+        
+        Args:
+            rows (list): Table rows as returned by _read_table_rows; no WebDriver calls are made
+        """
+        # Look for row with TH elements
+        for i, (th_cells, td_cells) in enumerate(rows[:3]):
+            if th_cells:
+                return i
+        
+        # Look for row with header-like content. Column names like Dept and Course lead the
+        # row, so probe the first few cells before joining the whole (possibly wide) row
+        for i, (th_cells, td_cells) in enumerate(rows[:3]):
+            if not td_cells:
+                continue
+            if HEADER_ROW_RE.search(" ".join(td_cells[:3]).lower()):
+                return i
+            if len(td_cells) > 3 and HEADER_ROW_RE.search(" ".join(td_cells).lower()):
+                return i
+        
+        # Default to first row
+        return 0
     
     def _is_valid_course_data_row(self, row_data):
         """
@@ -853,59 +1344,53 @@ class UofTCourseEvaluationScraper:
         """
         try:
             # Check if we have any data at all
-            if not any(value for value in row_data.values() if value and value.strip()):
+            if not any(value and value.strip() for value in row_data.values()):
                 return False
             
-            # Get key fields for validation with flexible field names
-            dept = ""
-            course = ""
-            name_field = ""
-            
-            # Try different possible column names for common fields
-            for key, value in row_data.items():
-                key_lower = key.lower()
-                if 'dept' in key_lower or 'department' in key_lower:
-                    dept = value.strip()
-                elif 'course' in key_lower or 'subject' in key_lower:
-                    course = value.strip()
-                elif 'name' in key_lower or 'instructor' in key_lower:
-                    name_field = value.strip()
-            
-            # Skip obvious header rows
-            header_indicators = [
-                'dept', 'department', 'division', 'course', 'subject', 'code',
-                'last name', 'first name', 'instructor', 'term', 'year', 'semester',
-                'number', 'invited', 'responses', 'evaluation', 'rating', 'mean'
-            ]
-            
-            # Check if any field contains header-like text
+            # Get key fields for validation with flexible field names (every row of a
+            # table has the same columns, so they are only worked out once per table)
+            dept_key, course_key, name_key = key_field_columns(tuple(row_data))
+            dept = row_data[dept_key].strip() if dept_key else ""
+            course = row_data[course_key].strip() if course_key else ""
+            name_field = row_data[name_key].strip() if name_key else ""
+            
+            # Skip obvious header rows: check if any field contains header-like text
             for value in [dept, course, name_field]:
-                if value.lower() in header_indicators:
-                    print(f"Skipping header row: {dept}, {course}, {name_field}")
+                if value.lower() in HEADER_INDICATORS:
+                    logger.debug("Skipping header row: %s, %s, %s", dept, course, name_field)
                     return False
             
+            # Check for course patterns (letters followed by numbers). Course patterns are strong
+            # indicators, enough on their own, and they are what nearly every data row has
+            if course and COURSE_RE.match(course):
+                return True
+            
             # More sophisticated validation
             valid_indicators = 0
             
             # Check for department codes (usually 3-4 capital letters)
-            if dept and re.match(r'^[A-Z]{2,5}$', dept):
+            if dept and DEPT_RE.match(dept):
                 valid_indicators += 1
             
-            # Check for course patterns (letters followed by numbers)
-            if course and re.match(r'^[A-Z]{2,5}\d+[A-Z]?\d*$', course):
-                valid_indicators += 2  # Course patterns are strong indicators
-            
             # Check for names (contains letters and possibly spaces/apostrophes)
-            if name_field and re.match(r"^[A-Za-z\s'\-\.]+$", name_field) and len(name_field) > 2:
+            if name_field and NAME_RE.match(name_field) and len(name_field) > 2:
                 valid_indicators += 1
             
-            # Check for numeric data in evaluation columns
+            # Department and name together are already enough
+            if valid_indicators >= 2:
+                return True
+            
+            # Count numeric data in evaluation columns and non-empty fields in one pass
             numeric_count = 0
-            for key, value in row_data.items():
-                if value and value.strip():
-                    # Check for numeric patterns that suggest evaluation data
-                    if re.match(r'^\d+\.?\d*$', value.strip()) or value.strip() in ['Fall', 'Winter', 'Summer', 'Spring']:
-                        numeric_count += 1
+            non_empty_count = 0
+            for value in row_data.values():
+                if value:
+                    value = value.strip()
+                    if value:
+                        non_empty_count += 1
+                        # Check for numeric patterns that suggest evaluation data
+                        if NUMBER_RE.match(value) or value in SEMESTERS:
+                            numeric_count += 1
             
             if numeric_count >= 3:  # At least 3 numeric/term fields
                 valid_indicators += 1
@@ -915,13 +1400,9 @@ class UofTCourseEvaluationScraper:
                 return True
             
             # Fallback: if we have substantial non-empty data, accept it
-            non_empty_count = sum(1 for value in row_data.values() if value and value.strip())
             if non_empty_count >= 5:  # At least 5 fields with data
                 # Make sure it's not all header text
-                header_like_count = 0
-                for value in row_data.values():
-                    if value and any(indicator in value.lower() for indicator in header_indicators):
-                        header_like_count += 1
+                header_like_count = sum(1 for value in row_data.values() if value and HEADER_INDICATORS_RE.search(value.lower()))
                 
                 if header_like_count < non_empty_count * 0.3:  # Less than 30% header-like text
                     return True
@@ -937,16 +1418,11 @@ class UofTCourseEvaluationScraper:
         page_info = {}
         
         try:
-            # Try to find any page headers or descriptions
+            # Try to find any page headers or descriptions, all selectors checked in one call
             header_selectors = ["h1", "h2", ".page-title", ".header", "[class*='title']"]
-            for selector in header_selectors:
-                try:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if element.text.strip():
-                        page_info['page_header'] = element.text.strip()
-                        break
-                except NoSuchElementException:
-                    continue
+            header_text = self.driver.execute_script(PAGE_HEADER_SCRIPT, header_selectors)
+            if header_text:
+                page_info['page_header'] = header_text
                 
         except Exception as e:
             print(f"Error extracting page info: {str(e)}")
@@ -966,23 +1442,21 @@ class UofTCourseEvaluationScraper:
         
         # Save as JSON
         json_filename = f"{filename}.json"
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(json_filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         print(f"Data saved to {json_filename}")
         
         # Save as CSV - use the evaluation_data directly if it exists
         csv_filename = f"{filename}.csv"
         
         if data.get('evaluation_data') and isinstance(data['evaluation_data'], list):
-            # Save the table data directly as CSV
-            df = pd.DataFrame(data['evaluation_data'])
-            df.to_csv(csv_filename, index=False)
+            # Save the table data directly as CSV, streamed row by row
+            self._write_csv(csv_filename, data['evaluation_data'])
             print(f"Course evaluation data saved to {csv_filename} ({len(data['evaluation_data'])} records)")
         else:
             # Fallback to flattened data
             flattened_data = self._flatten_data(data)
-            df = pd.DataFrame([flattened_data])
-            df.to_csv(csv_filename, index=False)
+            self._write_csv(csv_filename, [flattened_data])
             print(f"Flattened data saved to {csv_filename}")
     
     def _flatten_data(self, data):
@@ -1008,9 +1482,21 @@ class UofTCourseEvaluationScraper:
         return flattened
     
     def close(self):
-        """Close the browser driver"""
-        if self.driver:
+        """Close the browser driver, or return it to the pool if it was borrowed from there"""
+        if self.driver and self._pooled:
+            # Leave nothing from this session behind for the next borrower
+            try:
+                self.driver.delete_all_cookies()
+                self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+                # Don't hand over a page that the next borrower's grid waits would accept
+                self.driver.get("about:blank")
+            except Exception as e:
+                print(f"Could not clear browser state: {e}")
+            _driver_pools[self.headless].put(self.driver)
+        elif self.driver:
             self.driver.quit()
+        self.driver = None
+        self.cache.close()
     
     def __enter__(self):
         return self
@@ -1037,103 +1523,68 @@ class UofTCourseEvaluationScraper:
                 print("Page size selector container not found - continuing with default page size")
                 return False
             
-            # Wait longer for dynamic content to load - the page size selector might be populated via JavaScript
+            # The page size selector is populated via JavaScript; return as soon as it has content
             print("Waiting for page size selector to be populated with options...")
-            time.sleep(8)  # Increased wait time for dynamic loading
-            
-            # Try multiple approaches to wait for the selector to be populated
-            max_wait_attempts = 10
-            for attempt in range(max_wait_attempts):
-                try:
-                    # Check if the container now has content
-                    container = self.driver.find_element(By.ID, "fbvGridPageSizeSelectLvl1")
-                    container_html = container.get_attribute("innerHTML")
-                    
-                    if container_html.strip():
-                        print(f"Page size container populated on attempt {attempt + 1}")
-                        print(f"Container content: {container_html}")
-                        break
-                    else:
-                        print(f"Attempt {attempt + 1}: Container still empty, waiting...")
-                        time.sleep(2)
-                        
-                        # Try to trigger any JavaScript that might populate the selector
-                        if attempt == 3:
-                            print("Trying to trigger page size selector loading...")
-                            self.driver.execute_script("""
-                                // Try to trigger any onload or initialization functions
-                                if (typeof window.initPageSize === 'function') window.initPageSize();
-                                if (typeof window.loadPageSizeSelector === 'function') window.loadPageSizeSelector();
-                                
-                                // Try to find and trigger any page size related functions
-                                for (var prop in window) {
-                                    if (prop.toLowerCase().includes('pagesize') && typeof window[prop] === 'function') {
-                                        try { window[prop](); } catch(e) {}
-                                    }
-                                }
-                            """)
-                        
-                except Exception as e:
-                    print(f"Error checking container on attempt {attempt + 1}: {e}")
-                    continue
-            
-            # Check final state
             try:
-                container = self.driver.find_element(By.ID, "fbvGridPageSizeSelectLvl1")
-                container_html = container.get_attribute("innerHTML")
-                if not container_html.strip():
+                container_html = WebDriverWait(self.driver, PAGE_SIZE_POPULATE_GRACE, poll_frequency=POLL_INTERVAL).until(
+                    ElementPopulated("fbvGridPageSizeSelectLvl1"))
+            except TimeoutException:
+                # Try to trigger any JavaScript that might populate the selector, once
+                print("Trying to trigger page size selector loading...")
+                self.driver.execute_script("""
+                    // Try to trigger any onload or initialization functions
+                    if (typeof window.initPageSize === 'function') window.initPageSize();
+                    if (typeof window.loadPageSizeSelector === 'function') window.loadPageSizeSelector();
+                    
+                    // Try to find and trigger any page size related functions
+                    for (var prop in window) {
+                        if (prop.toLowerCase().includes('pagesize') && typeof window[prop] === 'function') {
+                            try { window[prop](); } catch(e) {}
+                        }
+                    }
+                """)
+                try:
+                    container_html = WebDriverWait(
+                        self.driver, PAGE_SIZE_POPULATE_TIMEOUT - PAGE_SIZE_POPULATE_GRACE, poll_frequency=POLL_INTERVAL
+                    ).until(ElementPopulated("fbvGridPageSizeSelectLvl1"))
+                except TimeoutException:
                     print("Page size container remained empty - selector may not be available for this dataset")
                     return False
-            except Exception as e:
-                print(f"Could not inspect final container state: {e}")
-                return False            
-            # Try to find page size selectors using multiple strategies
-            page_size_selectors = [
-                "#fbvGridPageSizeSelectBlock select",
-                ".pageSizeSelectWrapper select", 
-                ".select-pageSize select",
-                "#fbvGridPageSizeSelectLvl1 select",
-                "select[name*='PageSize']",
-                "select[name*='pagesize']", 
-                "select[id*='PageSize']",
-                "select[id*='pagesize']",
-                "select[onchange*='PageSize']",
-                "select[onchange*='pagesize']"
-            ]
+            print("Page size container populated")
+            print(f"Container content: {container_html}")
             
+            # Try to find page size selectors using multiple strategies, all in one script call
             select_element = None
             current_page_size = None
             
             print("Searching for page size selector using multiple strategies...")
-            for i, selector in enumerate(page_size_selectors):
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        select_element = elements[0]
-                        current_page_size = int(select_element.get_attribute("value"))
-                        print(f"Found page size select using selector #{i+1} '{selector}' with current value: {current_page_size}")
-                        break
-                except Exception as e:
-                    continue
+            try:
+                match = self.driver.execute_script(FIND_FIRST_SCRIPT, PAGE_SIZE_SELECTORS)
+                if match:
+                    element, value, i = match
+                    current_page_size = int(value)
+                    select_element = element
+                    print(f"Found page size select using selector #{i+1} '{PAGE_SIZE_SELECTORS[i]}' with current value: {current_page_size}")
+            except Exception as e:
+                print(f"Page size selector lookup failed: {e}")
             
             # If still not found, try a more comprehensive approach
+            select_options = None
             if not select_element:
                 print("Standard selectors failed, trying comprehensive search...")
                 try:
-                    # Find all select elements on the page
-                    all_selects = self.driver.find_elements(By.TAG_NAME, "select")
+                    # Find all select elements on the page, with their options, in one call
+                    all_selects = self.driver.execute_script(SELECT_OPTIONS_SCRIPT)
                     print(f"Found {len(all_selects)} total select elements on page")
                     
-                    for i, select in enumerate(all_selects):
+                    for i, (select, select_value, options) in enumerate(all_selects):
                         try:
-                            options = select.find_elements(By.TAG_NAME, "option")
                             if len(options) >= 3:  # Must have multiple options
                                 # Check if options look like page sizes (numbers like 5, 10, 25, 50, 100)
                                 option_values = []
-                                for option in options:
+                                for _, value, _ in options:
                                     try:
-                                        val = int(option.get_attribute("value"))
-                                        option_values.append(val)
+                                        option_values.append(int(value))
                                     except (ValueError, TypeError):
                                         continue
                                 
@@ -1143,7 +1594,8 @@ class UofTCourseEvaluationScraper:
                                     all(val > 0 for val in option_values)):  # All positive numbers
                                     
                                     select_element = select
-                                    current_page_size = int(select.get_attribute("value"))
+                                    select_options = options
+                                    current_page_size = int(select_value)
                                     print(f"Found page size select #{i+1} by content analysis")
                                     print(f"Available page sizes: {sorted(option_values)}")
                                     print(f"Current page size: {current_page_size}")
@@ -1156,16 +1608,18 @@ class UofTCourseEvaluationScraper:
             
             if not select_element:
                 print("Could not find any page size selector on the page")
-                return False            # Get all available options and find the maximum (ideally 100)
-            options = select_element.find_elements(By.TAG_NAME, "option")
-            print(f"Found {len(options)} page size options")
+                return False
+            
+            # Get all available options and find the maximum (ideally 100)
+            if select_options is None:
+                select_options = self.driver.execute_script(SELECT_OPTIONS_SCRIPT, select_element)[0][2]
+            print(f"Found {len(select_options)} page size options")
             
             # Display all available options
             available_options = []
-            for option in options:
+            for option, value, option_text in select_options:
                 try:
-                    value = int(option.get_attribute("value"))
-                    option_text = option.text.strip()
+                    value = int(value)
                     available_options.append((value, option_text, option))
                     print(f"Option: {option_text} (value: {value})")
                 except (ValueError, TypeError):
@@ -1198,6 +1652,10 @@ class UofTCourseEvaluationScraper:
                 print(f"Changing page size from {current_page_size} to {max_value} records per page")
                 
                 try:
+                    # Mark the select and count the rows on the page before the change, to tell
+                    # when the grid has re-rendered
+                    rows_before = self.driver.execute_script(PageSizeRefreshed.MARK_SCRIPT, select_element)
+                    
                     # Use multiple methods to ensure the change is applied
                     success_methods = []
                     
@@ -1247,53 +1705,27 @@ class UofTCourseEvaluationScraper:
                     
                     print(f"Applied page size change using methods: {success_methods}")
                     
-                    # Wait for the page to refresh after changing page size
+                    # Wait for the grid to re-render: the old select is replaced, or the page gains
+                    # rows over what it had before the change. The data table itself is waited for afterwards
                     print("Waiting for table to refresh after page size change...")
-                    time.sleep(8)  # Longer wait for larger datasets
-                    
-                    # Check for page refresh indicators
-                    try:
-                        # Method 1: Wait for stale element (indicates page refresh)
-                        WebDriverWait(self.driver, 15).until(EC.staleness_of(select_element))
-                        print("Page refresh detected via stale element")
-                    except TimeoutException:
-                        print("No stale element detected, checking other refresh indicators...")
-                        
-                        # Method 2: Check if table content changed significantly
-                        try:
-                            tables = self.driver.find_elements(By.TAG_NAME, "table")
-                            for table in tables:
-                                rows = table.find_elements(By.TAG_NAME, "tr")
-                                if len(rows) > 50:  # If we see many more rows, page size likely changed
-                                    print(f"Detected larger table with {len(rows)} rows - page size change likely successful")
-                                    break
-                        except Exception as e:
-                            print(f"Could not check table size: {e}")
-                    
-                    # Wait for new table to be present and stable
+                    new_select_value = None
                     try:
-                        self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-                        time.sleep(3)  # Additional stability wait
-                        print("New table loaded after page size change")
+                        new_select_value, = WebDriverWait(self.driver, 15, poll_frequency=POLL_INTERVAL).until(
+                            PageSizeRefreshed(rows_before))
+                        print("Table refresh detected after page size change")
                     except TimeoutException:
-                        print("Warning: Table not detected after page size change")
+                        print("Warning: No table refresh detected after page size change")
                     
                     # Verify the change was successful
                     verification_success = False
                     try:
-                        # Try to find the select element again and check its value
-                        new_select = None
-                        for selector in page_size_selectors:
-                            try:
-                                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                                if elements:
-                                    new_select = elements[0]
-                                    break
-                            except:
-                                continue
+                        # The refresh check already read the select's value; look it up again otherwise
+                        if new_select_value is None:
+                            match = self.driver.execute_script(FIND_FIRST_SCRIPT, PAGE_SIZE_SELECTORS)
+                            new_select_value = match[1] if match else None
                         
-                        if new_select:
-                            new_value = int(new_select.get_attribute("value"))
+                        if new_select_value is not None:
+                            new_value = int(new_select_value)
                             print(f"Page size after change: {new_value}")
                             if new_value == max_value:
                                 verification_success = True
@@ -1320,9 +1752,74 @@ class UofTCourseEvaluationScraper:
             traceback.print_exc()
             return False
       
+    def _open_incremental_files(self):
+        """Open the CSV and NDJSON files that save_incremental_data appends each page to"""
+        # Buffers big enough to hold the FLUSH_EVERY pages between checkpoints, so they reach
+        # the disk in one write instead of one per few kilobytes
+        self._csv_file = open(f"{self.base_filename}.csv", 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        self._csv_writer = None  # Created once the first page tells us the columns
+        self._csv_row_values = None
+        self._csv_columns = {}  # Every column seen so far, in order of first appearance
+        self._records_file = open(f"{self.base_filename}.ndjson", 'wb', buffering=WRITE_BUFFER_SIZE)
+        self._pages_since_flush = 0
+    
+    def _flush_incremental_files(self):
+        """Push the pages appended since the last checkpoint to disk and rewrite the manifest"""
+        self._csv_file.flush()
+        self._records_file.flush()
+        self._write_json_atomic(f"{self.base_filename}.manifest.json", self.combined_data['page_info'])
+        self._pages_since_flush = 0
+    
+    def _close_incremental_files(self):
+        """Close the incremental files"""
+        self._flush_incremental_files()
+        self._records_file.close()
+        self._csv_file.close()
+    
+    def _write_combined_json(self):
+        """
+        Write the finished scrape as one gzipped JSON document ({base_filename}.json.gz), once
+        at the end. The records are repeated keys and short numeric strings, so it compresses
+        several times over. Written to a temporary file first so a reader never sees a half-written file
+        """
+        json_filename = f"{self.base_filename}.json.gz"
+        self._write_json_atomic(json_filename, self.combined_data, option=orjson.OPT_INDENT_2, compress=True)
+        print(f"Combined data written to {json_filename}")
+    
+    def _write_json_atomic(self, filename, data, option=None, compress=False):
+        """
+        Write data as JSON to a temporary file and rename it over filename, so it is never half-written
+        
+        Args:
+            compress (bool): Gzip the JSON
+        """
+        with (gzip.open if compress else open)(filename + ".tmp", 'wb') as f:
+            f.write(orjson.dumps(data, option=option))
+        os.replace(filename + ".tmp", filename)
+    
+    def _write_csv(self, filename, records):
+        """Write records to a CSV file with one column per key, blank where a record lacks it"""
+        columns = list(dict.fromkeys(key for record in records for key in record))
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval="", lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(records)
+    
+    def _new_csv_writer(self):
+        """Set up the CSV writers for every column seen so far, appending to the open CSV file"""
+        self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=list(self._csv_columns), restval="",
+                                          extrasaction='ignore', lineterminator='\n')
+        # Rows that have every header column go straight through csv.writer, their values
+        # picked in header order by one itemgetter call instead of DictWriter's per-cell lookups
+        fieldnames = self._csv_writer.fieldnames
+        self._csv_fieldnames = frozenset(fieldnames)
+        self._csv_row_values = itemgetter(*fieldnames) if len(fieldnames) > 1 else None  # One name would give a bare value
+        self._csv_rows_writer = csv.writer(self._csv_file, lineterminator='\n')
+    
     def save_incremental_data(self, page_data, current_page):
         """
-        Add data from a single page to the combined data structure
+        Add data from a single page to the combined data structure and append it
+        to the CSV and NDJSON files opened by _open_incremental_files
         
         Args:
             page_data (list): List of records from the current page
@@ -1337,16 +1834,102 @@ class UofTCourseEvaluationScraper:
         self.combined_data['page_info']['total_pages'] = max(current_page, self.combined_data['page_info']['total_pages'])
         self.combined_data['page_info']['total_records'] = len(self.combined_data['evaluation_data'])
         
-        # Save the updated combined data to JSON and CSV
-        json_filename = f"{self.base_filename}.json"
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(self.combined_data, f, indent=2, ensure_ascii=False)
-        # Save or update the CSV file
-        csv_filename = f"{self.base_filename}.csv"
-        df = pd.DataFrame(self.combined_data['evaluation_data'])
-        df.to_csv(csv_filename, index=False)
+        # Only the new page is written; the file is only rewritten on the rare page that brings new columns
+        if self._csv_row_values and all(row.keys() == self._csv_fieldnames for row in page_data):
+            # Exactly the header's columns, as on nearly every page: no column bookkeeping, and the
+            # values go straight through csv.writer, picked in header order by one itemgetter call
+            self._csv_rows_writer.writerows(map(self._csv_row_values, page_data))
+        else:
+            # Merge in the keys of any row that brings new columns
+            columns = self._csv_columns
+            for row in page_data:
+                if not row.keys() <= columns.keys():
+                    columns.update(dict.fromkeys(row))
+            if self._csv_writer is not None and len(columns) != len(self._csv_writer.fieldnames):
+                # The header is already on disk, so rewrite the file once under the full header (this
+                # page included) and append after it from now on; the CSV is complete at every checkpoint
+                print(f"Page {current_page} added columns, rewriting the CSV with the full header...")
+                self._csv_file.close()
+                self._write_csv(self._csv_file.name, self.combined_data['evaluation_data'])
+                self._csv_file = open(self._csv_file.name, 'a', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+                self._new_csv_writer()
+            else:
+                if self._csv_writer is None:
+                    self._new_csv_writer()
+                    self._csv_writer.writeheader()
+                if self._csv_row_values and all(row.keys() >= self._csv_fieldnames for row in page_data):
+                    self._csv_rows_writer.writerows(map(self._csv_row_values, page_data))
+                else:
+                    self._csv_writer.writerows(page_data)
+        self._records_file.write(b"".join(orjson.dumps(row) + b"\n" for row in page_data))
+        
+        # Flush and update the (compact) progress manifest every FLUSH_EVERY pages rather than every page
+        self._pages_since_flush += 1
+        if self._pages_since_flush >= FLUSH_EVERY:
+            self._flush_incremental_files()
         
-        print(f"✓ Page {current_page} data added to combined files: {json_filename} and {csv_filename} (Total: {len(self.combined_data['evaluation_data'])} records)")
+        print(f"✓ Page {current_page} data appended to {self._csv_file.name} and {self._records_file.name} (Total: {len(self.combined_data['evaluation_data'])} records)")
+
+
+def _init_scrape_worker():
+    """Set up a worker process of the __main__ pool"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Worker processes exit without running atexit handlers, so quit the worker's pooled
+    # browsers from a multiprocessing finalizer instead
+    multiprocessing.util.Finalize(None, close_driver_pool, exitpriority=0)
+
+
+def scrape_one(url, index=1):
+    """
+    Scrape one course evaluation URL and save its data, in a browser borrowed
+    from the (per-process) pool so the next URL scraped by the same worker reuses it
+    
+    Args:
+        url (str): URL of the course evaluation page
+        index (int): Position of the URL in the list, used in the filenames if it has no blockid
+        
+    Returns:
+        int: Number of records scraped, or None if scraping failed
+    """
+    print(f"\n--- Scraping URL {index}: {url} ---")
+    url_identifier = url.split('blockid=')[1][:10] if 'blockid=' in url else str(index)
+    
+    with UofTCourseEvaluationScraper.from_pool(headless=HEADLESS) as scraper:
+        # Name the incremental files after the URL, as other workers write theirs at the same time
+        scraper.reset_state(url_identifier)
+        try:
+            # Scrape course evaluation data
+            result = scraper.scrape_course_evaluation(url)
+            
+            if result:
+                print(f"\nScraping completed successfully!")
+                print(f"Total pages scraped: {result['page_info']['total_pages']}")
+                print(f"Total records found: {result['page_info']['total_records']}")
+                
+                # Show table structure info
+                if 'table_structure' in result['page_info']:
+                    structure = result['page_info']['table_structure']
+                    print(f"Detected table structure:")
+                    print(f"  - Total columns: {structure.get('total_columns', 'Unknown')}")
+                    print(f"  - Division type: {structure.get('division_type', 'Unknown')}")
+                    print(f"  - Has instructor ratings: {structure.get('has_instructor_ratings', False)}")
+                    print(f"  - Has course ratings: {structure.get('has_course_ratings', False)}")
+                    print(f"  - Has response counts: {structure.get('has_response_counts', False)}")
+                
+                # Save data with URL-specific filename
+                filename = f"course_evaluation_{url_identifier}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                scraper.save_data(result, filename)
+                print(f"Data saved to files with base name: {filename}")
+                return result['page_info']['total_records']
+            else:
+                print("Failed to scrape course evaluation data")
+                
+        except Exception as e:
+            print(f"Error during scraping: {e}")
+            traceback.print_exc()
+        finally:
+            print("Scraping session ended for this URL")
+    return None
 
 
 # Example usage
@@ -1368,49 +1951,21 @@ if __name__ == "__main__":
         "https://course-evals.utoronto.ca/BPI/fbview.aspx?blockid=06hZnPtQJdcYZAV8ru",  # UT Scarborough (Undergraduate)
     ]
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("University of Toronto Course Evaluation Scraper - Enhanced Version")
     print("=" * 60)
     
-    for i, url in enumerate(urls, 1):
-        print(f"\n--- Testing URL {i}/{len(urls)} ---")
-        print(f"URL: {url}")
-        
-        # Create scraper instance
-        with UofTCourseEvaluationScraper(headless=False) as scraper:  # max_pages parameter removed as it's no longer used
-            try:
-                # Scrape course evaluation data
-                result = scraper.scrape_course_evaluation(url)
-                
-                if result:
-                    print(f"\nScraping completed successfully!")
-                    print(f"Total pages scraped: {result['page_info']['total_pages']}")
-                    print(f"Total records found: {result['page_info']['total_records']}")
-                    
-                    # Show table structure info
-                    if 'table_structure' in result['page_info']:
-                        structure = result['page_info']['table_structure']
-                        print(f"Detected table structure:")
-                        print(f"  - Total columns: {structure.get('total_columns', 'Unknown')}")
-                        print(f"  - Division type: {structure.get('division_type', 'Unknown')}")
-                        print(f"  - Has instructor ratings: {structure.get('has_instructor_ratings', False)}")
-                        print(f"  - Has course ratings: {structure.get('has_course_ratings', False)}")
-                        print(f"  - Has response counts: {structure.get('has_response_counts', False)}")
-                    
-                    # Save data with URL-specific filename
-                    url_identifier = url.split('blockid=')[1][:10] if 'blockid=' in url else str(i)
-                    filename = f"course_evaluation_{url_identifier}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                    scraper.save_data(result, filename)
-                    print(f"Data saved to files with base name: {filename}")
-                else:
-                    print("Failed to scrape course evaluation data")
-                    
-            except KeyboardInterrupt:
-                print("\nScraping interrupted by user")
-                break
-            except Exception as e:
-                print(f"Error during scraping: {e}")
-                traceback.print_exc()
-            finally:
-                print("Scraping session ended for this URL")
+    # The URLs are independent, so scrape several side by side, one browser per worker
+    with ProcessPoolExecutor(max_workers=SCRAPE_WORKERS, initializer=_init_scrape_worker) as pool:
+        futures = {pool.submit(scrape_one, url, i): url for i, url in enumerate(urls, 1)}
+        try:
+            for future in as_completed(futures):
+                records = future.result()
+                status = f"{records} records" if records is not None else "failed"
+                print(f"Finished {futures[future]}: {status}")
+        except KeyboardInterrupt:
+            print("\nScraping interrupted by user")
+            pool.shutdown(cancel_futures=True)
     
     print("\nAll scraping sessions completed.")